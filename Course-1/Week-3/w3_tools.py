@@ -53,11 +53,171 @@ def update_parameters(parameters, grads, learning_rate = 1.2):
     
     return parameters
 
-def train_nn(parameters, A, X, Y):
-    # Backpropagation. Inputs: "A, X, Y". Outputs: "grads".
-    grads = backward_propagation(A, X, Y)
+def training_buffers(parameters, X, Y):
+    """
+    Allocates the arrays reused by train_step across iterations. W and b are
+    kept side by side in one matrix Wb and X gets a row of ones, so that
+    Wb X1 = W X + b and one matrix product handles both parameters
+    
+    Arguments:
+    parameters -- python dictionary containing parameters 
+    X -- input data of shape (n_x, number of examples)
+    Y -- "true" labels vector of shape (n_y, number of examples)
+    
+    Returns:
+    buffers -- python dictionary with Wb, X1, X1 transposed in contiguous memory and the buffers for dZ and dWb
+    """
+    Wb = np.hstack([parameters["W"], parameters["b"]]).astype(float)
+    X1 = np.vstack([X, np.ones((1, X.shape[1]))])
+    
+    buffers = {"Wb": Wb,
+               "W": Wb[:, :-1],
+               "b": Wb[:, -1:],
+               "X1": X1,
+               "X1T": np.ascontiguousarray(X1.T),
+               "dZ": np.empty(Y.shape),
+               "dWb": np.empty(Wb.shape)}
+    
+    return buffers
+
+def train_step(buffers, Y, learning_rate = 1.2, A = None):
+    """
+    Runs forward propagation, backward propagation and the parameter update in
+    one go, updating buffers["Wb"] (and so the views buffers["W"] and
+    buffers["b"]) in place and writing every intermediate result into the
+    preallocated buffers, so a step allocates no arrays
+    
+    Arguments:
+    buffers -- python dictionary from training_buffers
+    Y -- "true" labels vector of shape (n_y, number of examples)
+    A -- the output of the neural network for the current parameters, computed if None
+    """
+    m = Y.shape[1]
+    dZ, dWb = buffers["dZ"], buffers["dWb"]
+    
+    # Forward propagation into the dZ buffer, then dZ = A - Y.
+    if A is None:
+        np.matmul(buffers["Wb"], buffers["X1"], out=dZ)
+    else:
+        dZ[...] = A
+    dZ -= Y
+    
+    # Backward propagation: [dW, db] = 1/m * dZ X1^T, then the update.
+    np.matmul(dZ, buffers["X1T"], out=dWb)
+    dWb *= learning_rate / m
+    buffers["Wb"] -= dWb
+
+def train_nn(parameters, A, X, Y, num_iterations = 1, learning_rate = 1.2):
+    """
+    Runs num_iterations steps of gradient descent, the first one from the given
+    output A of the network (which can be None to compute it). A single step,
+    as nn_model runs once per iteration, is the plain backward propagation and
+    update; more steps use fused in-place steps that reuse the same buffers in
+    every iteration, since setting them up copies X
+    
+    Returns:
+    parameters -- python dictionary containing updated parameters 
+    """
+    if num_iterations == 1:
+        if A is None:
+            A = np.matmul(parameters["W"], X) + parameters["b"]
+        grads = backward_propagation(A, X, Y)
+        return update_parameters(parameters, grads, learning_rate)
+    
+    buffers = training_buffers(parameters, X, Y)
     
-    # Gradient descent parameter update. Inputs: "parameters, grads". Outputs: "parameters".
-    parameters = update_parameters(parameters, grads)
+    for i in range(num_iterations):
+        train_step(buffers, Y, learning_rate, A if i == 0 else None)
+    
+    parameters = {"W": buffers["W"].copy(),
+                  "b": buffers["b"].copy()}
+    
+    return parameters
+
+def column_batches(X, Y, batch_size = 1024, shuffle = False, seed = None):
+    """
+    Yields blocks of columns of X and Y, reading them lazily so X and Y can be
+    memory-mapped arrays (np.load(path, mmap_mode="r")) larger than memory.
+    With shuffle the blocks come in random order and the columns inside each
+    block are permuted, which keeps the reads of a memory-mapped file contiguous
+    
+    Arguments:
+    X -- input data of shape (n_x, number of examples), an array or a path to a .npy file
+    Y -- "true" labels vector of shape (n_y, number of examples), an array or a path to a .npy file
+    batch_size -- number of examples per block
+    
+    Yields:
+    X_block, Y_block -- arrays of shape (n_x, batch_size) and (n_y, batch_size), the last block can be smaller
+    """
+    if isinstance(X, str):
+        X = np.load(X, mmap_mode = "r")
+    if isinstance(Y, str):
+        Y = np.load(Y, mmap_mode = "r")
+    m = X.shape[1]
+    
+    rng = np.random.default_rng(seed)
+    starts = np.arange(0, m, batch_size)
+    if shuffle:
+        starts = rng.permutation(starts)
+    
+    for start in starts:
+        X_block = np.asarray(X[:, start:start + batch_size], dtype = float)
+        Y_block = np.asarray(Y[:, start:start + batch_size], dtype = float)
+        if shuffle:
+            order = rng.permutation(X_block.shape[1])
+            X_block, Y_block = X_block[:, order], Y_block[:, order]
+        yield X_block, Y_block
+
+def train_nn_streaming(parameters, batches, num_epochs = 1, learning_rate = 1.2, full_batch = False, print_cost = False):
+    """
+    Trains the single layer model on data that arrives in blocks of columns,
+    so it never needs the whole design matrix in memory
+    
+    Arguments:
+    parameters -- python dictionary containing parameters 
+    batches -- function returning a fresh iterable of (X_block, Y_block) pairs for every epoch,
+               e.g. lambda: column_batches("X.npy", "Y.npy", batch_size = 4096, shuffle = True)
+    num_epochs -- number of passes over the data
+    full_batch -- if False, the parameters are updated after every block (mini-batch gradient descent);
+                  if True, dW and db are accumulated over all blocks and the parameters are updated
+                  once per epoch, which gives the same steps as train_nn on the full data
+    print_cost -- if True, print the cost of every epoch (for the parameters each block was seen with)
+    
+    Returns:
+    parameters -- python dictionary containing updated parameters 
+    """
+    W = parameters["W"].astype(float)
+    b = parameters["b"].astype(float)
+    
+    for epoch in range(num_epochs):
+        dW = np.zeros_like(W)
+        db = np.zeros_like(b)
+        cost = 0
+        m = 0
+        for X_block, Y_block in batches():
+            # Forward and backward propagation for the block, dZ = A - Y.
+            dZ = np.matmul(W, X_block)
+            dZ += b
+            dZ -= Y_block
+            cost += np.sum(dZ**2)
+            m_block = X_block.shape[1]
+            m += m_block
+            
+            if full_batch:
+                dW += np.matmul(dZ, X_block.T)
+                db += np.sum(dZ, axis = 1, keepdims = True)
+            else:
+                W -= learning_rate / m_block * np.matmul(dZ, X_block.T)
+                b -= learning_rate / m_block * np.sum(dZ, axis = 1, keepdims = True)
+        
+        if full_batch:
+            W -= learning_rate / m * dW
+            b -= learning_rate / m * db
+        
+        if print_cost:
+            print ("Cost after epoch %i: %f" %(epoch, cost/(2*m)))
+    
+    parameters = {"W": W,
+                  "b": b}
     
     return parameters
@@ -1,4 +1,7 @@
+import tempfile
+
 import numpy as np
+import pandas as pd
 
 # variables for the default_check test cases
 m = 30
@@ -448,3 +451,177 @@ def test_multi(target_nn_model, target_X_multi_norm, target_Y_multi_norm, target
     else:
         print("\033[92m", successful_cases, " Tests passed")
         print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_load_dataframe(target_load_dataframe):
+    successful_cases = 0
+    failed_cases = []
+
+    test_cases = [
+        {
+            "name": "default_check",
+            "input": {"path": "data/house_prices_train.csv", "columns": None},
+        },
+        {
+            "name": "missing_strings_check",
+            "input": {"path": "data/house_prices_train.csv", "columns": ["Alley", "PoolQC", "LotFrontage", "SalePrice"]},
+        },
+    ]
+
+    for test_case in test_cases:
+        path, columns = test_case["input"]["path"], test_case["input"]["columns"]
+        expected = pd.read_csv(path)
+        if columns is not None:
+            expected = expected[columns]
+        with tempfile.TemporaryDirectory() as cache_dir:
+            # The second load reads the cache the first one built.
+            for _ in range(2):
+                result = target_load_dataframe(path, columns, cache_dir=cache_dir)
+
+        try:
+            assert result.dtypes.equals(expected.dtypes)
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": dict(expected.dtypes[expected.dtypes != result.dtypes]),
+                    "got": dict(result.dtypes[expected.dtypes != result.dtypes]),
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong column dtypes, compared with pd.read_csv. \n\tExpected: {failed_cases[-1].get('expected')}.\n\tGot: {failed_cases[-1].get('got')}."
+            )
+
+        try:
+            assert result.equals(expected)
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": expected.isna().sum().sum(),
+                    "got": result.isna().sum().sum(),
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong values, compared with pd.read_csv. \n\tExpected number of missing values: {failed_cases[-1].get('expected')}.\n\tGot: {failed_cases[-1].get('got')}."
+            )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_train_nn(target_train_nn):
+    successful_cases = 0
+    failed_cases = []
+
+    rng = np.random.default_rng(0)
+    X_multi = rng.normal(0, 1, (2, 50))
+    Y_multi = np.array([[1.5, -0.7]]) @ X_multi + 0.3 + rng.normal(0, 0.1, (1, 50))
+
+    test_cases = [
+        {
+            "name": "default_check",
+            "input": {"X": X, "Y": Y, "W": np.array([[0.01]]), "b": np.array([[0.]]), "num_iterations": 5, "learning_rate": 1.2},
+        },
+        {
+            "name": "multi_check",
+            "input": {"X": X_multi, "Y": Y_multi, "W": np.array([[0.02, -0.01]]), "b": np.array([[0.5]]), "num_iterations": 20, "learning_rate": 0.3},
+        },
+    ]
+
+    for test_case in test_cases:
+        X_case, Y_case = test_case["input"]["X"], test_case["input"]["Y"]
+        learning_rate = test_case["input"]["learning_rate"]
+
+        # num_iterations single steps, as nn_model takes them.
+        expected_parameters = {"W": test_case["input"]["W"].copy(), "b": test_case["input"]["b"].copy()}
+        for _ in range(test_case["input"]["num_iterations"]):
+            expected_parameters = target_train_nn(expected_parameters, None, X_case, Y_case, 1, learning_rate)
+
+        result_parameters = target_train_nn(
+            {"W": test_case["input"]["W"].copy(), "b": test_case["input"]["b"].copy()}, None, X_case, Y_case,
+            test_case["input"]["num_iterations"], learning_rate
+        )
+
+        for key in ["W", "b"]:
+            try:
+                assert np.allclose(result_parameters[key], expected_parameters[key])
+                successful_cases += 1
+            except:
+                failed_cases.append(
+                    {
+                        "name": test_case["name"],
+                        "expected": expected_parameters[key],
+                        "got": result_parameters[key],
+                    }
+                )
+                print(
+                    f"Test case \"{failed_cases[-1].get('name')}\". Wrong {key} after num_iterations = {test_case['input']['num_iterations']}, compared with as many single steps. \n\tExpected: \n{failed_cases[-1].get('expected')}\n\tGot: \n{failed_cases[-1].get('got')}"
+                )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_train_nn_streaming(target_train_nn_streaming, target_train_nn, target_column_batches):
+    successful_cases = 0
+    failed_cases = []
+
+    test_cases = [
+        {
+            "name": "one_block_check",
+            "input": {"batch_size": 30, "shuffle": False, "num_epochs": 5, "learning_rate": 1.2},
+        },
+        {
+            "name": "uneven_blocks_check",
+            "input": {"batch_size": 7, "shuffle": False, "num_epochs": 5, "learning_rate": 1.2},
+        },
+        {
+            "name": "shuffled_blocks_check",
+            "input": {"batch_size": 4, "shuffle": True, "num_epochs": 10, "learning_rate": 0.5},
+        },
+    ]
+
+    for test_case in test_cases:
+        parameters = {"W": np.array([[0.01]]), "b": np.array([[0.]])}
+        num_epochs, learning_rate = test_case["input"]["num_epochs"], test_case["input"]["learning_rate"]
+
+        # With full_batch every epoch is one step of gradient descent on all the columns.
+        expected_parameters = target_train_nn(
+            {"W": parameters["W"].copy(), "b": parameters["b"].copy()}, None, X, Y, num_epochs, learning_rate
+        )
+        result_parameters = target_train_nn_streaming(
+            {"W": parameters["W"].copy(), "b": parameters["b"].copy()},
+            lambda: target_column_batches(X, Y, test_case["input"]["batch_size"], test_case["input"]["shuffle"], seed=0),
+            num_epochs, learning_rate, full_batch=True
+        )
+
+        for key in ["W", "b"]:
+            try:
+                assert np.allclose(result_parameters[key], expected_parameters[key])
+                successful_cases += 1
+            except:
+                failed_cases.append(
+                    {
+                        "name": test_case["name"],
+                        "expected": expected_parameters[key],
+                        "got": result_parameters[key],
+                    }
+                )
+                print(
+                    f"Test case \"{failed_cases[-1].get('name')}\". Wrong {key} of full batch streaming with batch_size = {test_case['input']['batch_size']}, compared with train_nn. \n\tExpected: \n{failed_cases[-1].get('expected')}\n\tGot: \n{failed_cases[-1].get('got')}"
+                )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
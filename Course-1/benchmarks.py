@@ -0,0 +1,96 @@
+"""
+Headless benchmarks for the Course-1 helpers.
+
+Times the training loop of the Week-3 assignment (forward propagation plus
+w3_tools.train_nn once per iteration) against the fused multi-iteration
+w3_tools.train_nn on the house_prices_train.csv regression, and loading two
+columns of that CSV with pandas against the columnar csv_cache, and reports
+throughput and peak traced memory. Results can be saved as a JSON baseline and
+later runs compared against it.
+
+    python benchmarks.py                          # default scales
+    python benchmarks.py --full                   # up to 1e6 iterations
+    python benchmarks.py --save-baseline base.json
+    python benchmarks.py --baseline base.json     # exits with 1 on regressions
+"""
+import os
+import sys
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.dirname(HERE))
+import csv_cache
+from benchmark_harness import load_module, main
+
+w3_tools = load_module("c1_w3_tools", os.path.join(HERE, "Week-3/w3_tools.py"))
+
+HOUSE_PRICES_CSV = os.path.join(HERE, "Week-3/data/house_prices_train.csv")
+
+
+@lru_cache(maxsize=1)
+def house_prices():
+    """ normalized X (2, m) and Y (1, m) of the Week-3 assignment's multiple regression """
+    df = pd.read_csv(HOUSE_PRICES_CSV)
+    X = df[["GrLivArea", "OverallQual"]]
+    Y = df["SalePrice"]
+    # Column-wise statistics with ddof=0, like np.mean and np.std gave on DataFrames before pandas 2.
+    X = np.array((X - X.mean()) / X.std(ddof=0)).T
+    Y = np.array((Y - Y.mean()) / Y.std(ddof=0)).reshape((1, -1))
+    return X, Y
+
+
+def initial_parameters():
+    rng = np.random.default_rng(0)
+    return {"W": rng.standard_normal((1, 2)) * 0.01, "b": np.zeros((1, 1))}
+
+
+def bench_train_nn_per_step(num_iterations):
+    # nn_model's loop: one forward pass and one single step train_nn call, the original code path, per iteration.
+    X, Y = house_prices()
+    parameters = initial_parameters()
+    for _ in range(num_iterations):
+        Y_hat = np.dot(parameters["W"], X) + parameters["b"]
+        parameters = w3_tools.train_nn(parameters, Y_hat, X, Y)
+    return num_iterations
+
+
+def bench_train_nn_fused(num_iterations):
+    X, Y = house_prices()
+    w3_tools.train_nn(initial_parameters(), None, X, Y, num_iterations)
+    return num_iterations
+
+
+def bench_read_csv(n_loads):
+    for _ in range(n_loads):
+        df = pd.read_csv(HOUSE_PRICES_CSV)
+        df["GrLivArea"].to_numpy(), df["SalePrice"].to_numpy()
+    return n_loads
+
+
+def bench_csv_cache(n_loads):
+    csv_cache.load_csv(HOUSE_PRICES_CSV)  # builds the cache on the first run
+    for _ in range(n_loads):
+        data = csv_cache.load_csv(HOUSE_PRICES_CSV, columns=["GrLivArea", "SalePrice"])
+        np.asarray(data["GrLivArea"]), np.asarray(data["SalePrice"])
+    return n_loads
+
+
+# name -> (function(scale) -> number of units processed (and extra results), unit, default scales, full scales)
+BENCHMARKS = {
+    "train_nn/per_step": (
+        bench_train_nn_per_step, "iterations", [10_000, 100_000], [10_000, 100_000, 1_000_000]
+    ),
+    "train_nn/fused": (
+        bench_train_nn_fused, "iterations", [10_000, 100_000], [10_000, 100_000, 1_000_000]
+    ),
+    "house_prices/read_csv": (bench_read_csv, "loads", [10, 100], [10, 100, 1_000]),
+    "house_prices/csv_cache": (bench_csv_cache, "loads", [10, 100], [10, 100, 1_000]),
+}
+
+
+if __name__ == "__main__":
+    sys.exit(main(BENCHMARKS, __doc__))
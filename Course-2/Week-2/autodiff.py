@@ -0,0 +1,180 @@
+import numpy as np
+
+
+def _times(t, factor, coefficient=1.0):
+    """ t * coefficient * factor, with the scalar products done first """
+    if not isinstance(t, np.ndarray):
+        t = t * coefficient
+        return factor if t == 1.0 else t * factor
+    if coefficient != 1.0:
+        t = t * coefficient
+    return t * factor
+
+
+def _scale(tangent, factor, coefficient=1.0):
+    return tuple(None if t is None else _times(t, factor, coefficient) for t in tangent)
+
+
+def _combine(tangent_a, factor_a, tangent_b, factor_b):
+    """ tangent_a * factor_a + tangent_b * factor_b, where a factor of None means 1 """
+    result = []
+    for t_a, t_b in zip(tangent_a, tangent_b):
+        a = t_a if t_a is None or factor_a is None else _times(t_a, factor_a)
+        b = t_b if t_b is None or factor_b is None else _times(t_b, factor_b)
+        if a is None or b is None:
+            result.append(b if a is None else a)
+        elif isinstance(a, np.ndarray) and a is not t_a and a is not factor_a:
+            # a is a new array of the full shape, so the sum can reuse it.
+            a += b
+            result.append(a)
+        else:
+            result.append(a + b)
+    return tuple(result)
+
+
+class dual:
+    """
+    Forward-mode dual number over NumPy arrays. value holds the function values
+    and tangent the derivatives with respect to each input variable, one array
+    per variable (None while it does not depend on that variable yet and a
+    scalar while the derivative is constant), so one
+    evaluation of f gives all partial derivatives at all points. Supports the
+    arithmetic operators and the ufuncs in DERIVATIVES.
+    """
+    # Makes numpy arrays and scalars on the left of an operator defer to dual.
+    __array_priority__ = 1000
+    __slots__ = ("value", "tangent")
+
+    def __init__(self, value, tangent):
+        self.value = value
+        self.tangent = tangent
+
+    def __add__(self, other):
+        if isinstance(other, dual):
+            return dual(self.value + other.value, _combine(self.tangent, None, other.tangent, None))
+        return dual(self.value + other, self.tangent)
+
+    __radd__ = __add__
+
+    def __sub__(self, other):
+        if isinstance(other, dual):
+            return dual(self.value - other.value, _combine(self.tangent, None, other.tangent, -1.0))
+        return dual(self.value - other, self.tangent)
+
+    def __rsub__(self, other):
+        return dual(other - self.value, _scale(self.tangent, -1.0))
+
+    def __mul__(self, other):
+        if isinstance(other, dual):
+            return dual(self.value * other.value, _combine(self.tangent, other.value, other.tangent, self.value))
+        return dual(self.value * other, _scale(self.tangent, other))
+
+    __rmul__ = __mul__
+
+    def __truediv__(self, other):
+        if isinstance(other, dual):
+            inverse = 1 / other.value
+            value = self.value * inverse
+            return dual(value, _combine(self.tangent, inverse, other.tangent, -value * inverse))
+        return dual(self.value / other, _scale(self.tangent, 1 / other))
+
+    def __rtruediv__(self, other):
+        inverse = 1 / self.value
+        value = other * inverse
+        return dual(value, _scale(self.tangent, -value * inverse))
+
+    def __neg__(self):
+        return dual(-self.value, _scale(self.tangent, -1.0))
+
+    def __pos__(self):
+        return self
+
+    def __pow__(self, exponent):
+        if isinstance(exponent, dual):
+            return np.exp(exponent * np.log(self))
+        if exponent == int(exponent) and 1 <= exponent <= 8:
+            # Small integer powers by repeated multiplication, much faster than np.power.
+            lower = self.value
+            for _ in range(int(exponent) - 2):
+                lower = lower * self.value
+            if exponent == 1:
+                return self
+            return dual(lower * self.value, _scale(self.tangent, lower, exponent))
+        return dual(self.value ** exponent, _scale(self.tangent, self.value ** (exponent - 1), exponent))
+
+    def __rpow__(self, base):
+        value = base ** self.value
+        return dual(value, _scale(self.tangent, value * np.log(base)))
+
+    def __array_ufunc__(self, ufunc, method, *inputs, **kwargs):
+        if method != "__call__" or kwargs:
+            return NotImplemented
+        if ufunc in OPERATORS:
+            return OPERATORS[ufunc](*inputs)
+        if ufunc in DERIVATIVES:
+            (x,) = inputs
+            return dual(ufunc(x.value), _scale(x.tangent, DERIVATIVES[ufunc](x.value)))
+        return NotImplemented
+
+
+# ufunc -> its derivative as a function of the input value.
+DERIVATIVES = {
+    np.exp: np.exp,
+    np.log: lambda x: 1 / x,
+    np.sin: np.cos,
+    np.cos: lambda x: -np.sin(x),
+    np.tan: lambda x: 1 / np.cos(x) ** 2,
+    np.sqrt: lambda x: 0.5 / np.sqrt(x),
+    np.tanh: lambda x: 1 - np.tanh(x) ** 2,
+    np.arctan: lambda x: 1 / (1 + x * x),
+    np.square: lambda x: 2 * x,
+}
+
+# Binary ufuncs reached when a numpy scalar or array is on the left of an operator.
+OPERATORS = {
+    np.add: lambda a, b: dual.__add__(a, b) if isinstance(a, dual) else dual.__radd__(b, a),
+    np.subtract: lambda a, b: dual.__sub__(a, b) if isinstance(a, dual) else dual.__rsub__(b, a),
+    np.multiply: lambda a, b: dual.__mul__(a, b) if isinstance(a, dual) else dual.__rmul__(b, a),
+    np.true_divide: lambda a, b: dual.__truediv__(a, b) if isinstance(a, dual) else dual.__rtruediv__(b, a),
+    np.power: lambda a, b: dual.__pow__(a, b) if isinstance(a, dual) else dual.__rpow__(b, a),
+    np.negative: dual.__neg__,
+}
+
+
+def gradient(f, chunk_size=2**14):
+    """
+    Returns a function computing all partial derivatives of f(x_1, ..., x_n) at
+    once, as a tuple of arrays with the broadcast shape of the inputs. Points
+    are processed chunk_size at a time, so the many intermediate arrays of the
+    dual arithmetic stay in cache.
+    """
+    def df(*args):
+        args = np.broadcast_arrays(*[np.asarray(arg, dtype=float) for arg in args])
+        n = len(args)
+        shape = args[0].shape
+        flat = [arg.ravel() for arg in args]
+        partials = np.zeros((n, flat[0].size))
+        for start in range(0, flat[0].size, chunk_size):
+            chunk = slice(start, start + chunk_size)
+            result = f(*[
+                dual(arg[chunk], tuple(1.0 if j == i else None for j in range(n)))
+                for i, arg in enumerate(flat)
+            ])
+            if isinstance(result, dual):
+                for i, t in enumerate(result.tangent):
+                    if t is not None:
+                        partials[i, chunk] = t
+        return tuple(partial.reshape(shape)[()] for partial in partials)
+    return df
+
+
+def derivative(f):
+    """ returns the derivative of a function of one variable """
+    df = gradient(f)
+    return lambda x: df(x)[0]
+
+
+def partial_derivatives(f):
+    """ returns one function per partial derivative of f(x, y), as the w2_tools examples ship them """
+    df = gradient(f)
+    return (lambda x, y: df(x, y)[0]), (lambda x, y: df(x, y)[1])
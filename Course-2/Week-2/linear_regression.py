@@ -0,0 +1,157 @@
+import numpy as np
+import pandas as pd
+from scipy.linalg import cho_factor, cho_solve, solve_triangular
+
+
+class linear_regression:
+    """
+    Least squares fit of y = X w + b from sufficient statistics that are
+    updated as rows arrive, so appending rows never needs the old ones.
+
+    The statistics are the means of X and y and the cross products of the
+    centered [X, y] (X^T X, X^T y and y^T y after centering), merged between
+    batches the way running variances are, which keeps them accurate when the
+    features are far from zero. With keep_qr=True the triangular factor R of
+    the QR decomposition of the centered [X, y] is kept as well, merged by
+    refactoring the two factors stacked on a row for the shift of the means.
+    """
+    def __init__(self, keep_qr=False):
+        self.keep_qr = keep_qr
+        self.n = 0
+        self.single_feature = None
+
+    def update(self, X, y):
+        ''' adds rows: X of shape (n,) for one feature or (n, k), y of shape (n,) '''
+        if self.single_feature is None:
+            self.single_feature = np.ndim(X) == 1
+        Z = np.column_stack([np.asarray(X, dtype=float).reshape(len(y), -1), y])
+        n_b = len(Z)
+        if n_b == 0:
+            return self
+
+        mean_b = Z.mean(axis=0)
+        Z -= mean_b
+        S_b = Z.T @ Z
+        R_b = np.linalg.qr(Z, mode="r") if self.keep_qr else None
+
+        if self.n == 0:
+            self.mean, self.S, self.R = mean_b, S_b, R_b
+        else:
+            n = self.n + n_b
+            delta = mean_b - self.mean
+            weight = self.n * n_b / n
+            self.S = self.S + S_b + weight * np.outer(delta, delta)
+            if self.keep_qr:
+                self.R = np.linalg.qr(np.vstack([self.R, R_b, np.sqrt(weight) * delta]), mode="r")
+            self.mean = self.mean + delta * n_b / n
+        self.n += n_b
+        return self
+
+    def solve(self, method="cholesky"):
+        '''
+        Returns the least squares (w, b), with w a float for one feature and an
+        array of shape (k,) otherwise. method is "normal" (np.linalg.solve of
+        the normal equations), "cholesky" or "qr".
+        '''
+        if self.n == 0:
+            raise ValueError("no rows added yet")
+        Sxx, Sxy = self.S[:-1, :-1], self.S[:-1, -1]
+        if method == "normal":
+            w = np.linalg.solve(Sxx, Sxy)
+        elif method == "cholesky":
+            w = cho_solve(cho_factor(Sxx), Sxy)
+        elif method == "qr":
+            if not self.keep_qr:
+                raise ValueError("the qr solver needs linear_regression(keep_qr=True)")
+            w = solve_triangular(self.R[:-1, :-1], self.R[:-1, -1])
+        else:
+            raise ValueError(f"method must be 'normal', 'cholesky' or 'qr', not {method!r}")
+        b = self.mean[-1] - self.mean[:-1] @ w
+        return (w[0] if self.single_feature else w), b
+
+    def cost(self, w, b):
+        ''' the cost E = 1/(2n) sum((X w + b - y)^2) of the rows added so far, from the statistics '''
+        v = np.append(w, -1.0)
+        offset = self.mean @ v + b
+        return (v @ self.S @ v + self.n * offset ** 2) / (2 * self.n)
+
+    def gradients(self, w, b):
+        ''' the partial derivatives dEdw and dEdb of cost, from the statistics '''
+        w = np.atleast_1d(w)
+        offset = self.mean[:-1] @ w + b - self.mean[-1]
+        dEdw = (self.S[:-1, :-1] @ w - self.S[:-1, -1]) / self.n + self.mean[:-1] * offset
+        return (dEdw[0] if self.single_feature else dEdw), offset
+
+    def gradient_descent(self, w=0, b=0, learning_rate=0.001, num_iterations=1000):
+        '''
+        gradient_descent_fit run on the statistics instead of the rows, so each
+        iteration costs O(k^2) for k features whatever the number of rows
+        '''
+        k = len(self.mean) - 1
+        w = np.broadcast_to(np.asarray(w, dtype=float), k).copy()
+        Sxx, Sxy = self.S[:-1, :-1] / self.n, self.S[:-1, -1] / self.n
+        mean_x, mean_y = self.mean[:-1], self.mean[-1]
+        for _ in range(num_iterations):
+            offset = mean_x @ w + b - mean_y
+            w, b = w - learning_rate * (Sxx @ w - Sxy + mean_x * offset), b - learning_rate * offset
+        return (w[0] if self.single_feature else w), b
+
+    def normalized(self):
+        '''
+        the statistics of the rows with every column of X and y standardized to
+        mean 0 and standard deviation 1, as (X - np.mean(X)) / np.std(X) does
+        '''
+        std = np.sqrt(np.diag(self.S) / self.n)
+        model = linear_regression(self.keep_qr)
+        model.n, model.single_feature = self.n, self.single_feature
+        model.mean = np.zeros_like(self.mean)
+        model.S = self.S / np.outer(std, std)
+        model.R = self.R / std if self.keep_qr else None
+        model.std = std
+        return model
+
+
+def fit_statistics(X, y, chunk_size=1_000_000, keep_qr=False):
+    ''' a linear_regression of the rows of X and y, fed chunk_size rows at a time '''
+    model = linear_regression(keep_qr)
+    for start in range(0, len(y), chunk_size):
+        model.update(X[start:start + chunk_size], y[start:start + chunk_size])
+    return model
+
+
+def fit(X, y, method="cholesky", chunk_size=1_000_000):
+    ''' fits y = X w + b with one of the solvers of linear_regression.solve '''
+    return fit_statistics(X, y, chunk_size, keep_qr=method == "qr").solve(method)
+
+
+def read_csv_statistics(path, x_columns, y_column, chunksize=100_000, keep_qr=False, **read_csv_kwargs):
+    '''
+    Builds a linear_regression in one pass over a CSV read chunksize rows at a
+    time, so files larger than memory can be fitted. x_columns is one column
+    name or a list of them.
+    '''
+    model = linear_regression(keep_qr)
+    usecols = ([x_columns] if isinstance(x_columns, str) else list(x_columns)) + [y_column]
+    for chunk in pd.read_csv(path, usecols=usecols, chunksize=chunksize, **read_csv_kwargs):
+        X = chunk[x_columns].to_numpy(dtype=float)
+        model.update(X, chunk[y_column].to_numpy(dtype=float))
+    return model
+
+
+def gradient_descent_fit(X, y, w=0, b=0, learning_rate=0.001, num_iterations=1000):
+    '''
+    Gradient descent on E = 1/(2n) sum((X w + b - y)^2) with the update of the
+    Week-2 assignment's gradient_descent, vectorized over the rows (and over
+    the features, for X of shape (n, k)). Returns (w, b) like linear_regression.solve.
+    '''
+    single_feature = np.ndim(X) == 1
+    X = np.asarray(X, dtype=float).reshape(len(y), -1)
+    y = np.asarray(y, dtype=float)
+    w = np.broadcast_to(np.asarray(w, dtype=float), X.shape[1]).copy()
+    n = len(y)
+    residual = np.empty(n)
+    for _ in range(num_iterations):
+        np.matmul(X, w, out=residual)
+        residual += b - y
+        w, b = w - learning_rate / n * (residual @ X), b - learning_rate / n * residual.sum()
+    return (w[0] if single_feature else w), b
@@ -0,0 +1,80 @@
+"""
+Incremental redraw helpers shared by the simulation and plotting widgets.
+
+Each week's folder is opened on its own by its notebooks, so this file is
+copied into every folder that uses it. Keep it identical to
+Course-3/Week-1/redraw.py.
+"""
+import numpy as np
+
+
+class artist_updater:
+    """
+    Redraws a fixed set of artists whose data is mutated in place, instead of
+    clearing the axes and creating new artists on every frame.
+
+    When the canvas is interactive and supports blitting, the registered
+    artists are marked animated, the static background is cached on every full
+    draw and a frame only redraws the registered artists. Otherwise (inline or
+    ipympl figures) a frame is a full canvas draw of the same artists.
+    """
+    def __init__(self, fig, blit=True):
+        self.fig = fig
+        self.canvas = fig.canvas
+        self.blit = (
+            blit
+            and self.canvas.supports_blit
+            and self.canvas.required_interactive_framework is not None
+        )
+        self.artists = []
+        self.background = None
+        if self.blit:
+            self.cid = self.canvas.mpl_connect("draw_event", self.on_draw)
+
+    def add(self, *artists):
+        """ registers artists that change between frames and returns the first one """
+        for artist in artists:
+            if self.blit:
+                artist.set_animated(True)
+            self.artists.append(artist)
+        return artists[0]
+
+    def clear(self):
+        for artist in self.artists:
+            artist.remove()
+        self.artists = []
+
+    def on_draw(self, event):
+        self.background = self.canvas.copy_from_bbox(self.fig.bbox)
+        self.draw_artists()
+
+    def draw_artists(self):
+        for artist in self.artists:
+            self.fig.draw_artist(artist)
+
+    def update(self):
+        """ draws one frame """
+        if self.blit and self.background is not None:
+            self.canvas.restore_region(self.background)
+            self.draw_artists()
+            self.canvas.blit(self.fig.bbox)
+        else:
+            self.canvas.draw()
+        self.canvas.flush_events()
+
+
+def set_stem_data(container, y, x=None, bottom=0):
+    """ moves the markers and stems of an ax.stem container to new data """
+    x = container.markerline.get_xdata() if x is None else x
+    container.markerline.set_data(x, y)
+    container.stemlines.set_segments(
+        np.stack(
+            [np.stack([x, np.full(len(x), bottom)], axis=1), np.stack([x, y], axis=1)],
+            axis=1,
+        )
+    )
+
+
+def set_scatter3d_offsets(collection, x, y, z):
+    """ moves the points of a scatter3D collection """
+    collection._offsets3d = (np.atleast_1d(x), np.atleast_1d(y), np.atleast_1d(z))
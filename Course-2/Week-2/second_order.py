@@ -0,0 +1,138 @@
+import numpy as np
+
+
+def gradients(dfdx, dfdy, points):
+    """ (N, 2) array of the gradients at an (N, 2) array of points """
+    x, y = points[:, 0], points[:, 1]
+    return np.column_stack([np.broadcast_to(dfdx(x, y), x.shape), np.broadcast_to(dfdy(x, y), x.shape)])
+
+
+def finite_difference_hessians(dfdx, dfdy, points, h=1e-5):
+    """ (N, 2, 2) array of symmetrized central difference Hessians at an (N, 2) array of points """
+    n = len(points)
+    # All four shifted copies of the points go through the derivatives in one batch.
+    shifts = np.array([[h, 0], [-h, 0], [0, h], [0, -h]])
+    g = gradients(dfdx, dfdy, (points[None, :, :] + shifts[:, None, :]).reshape(-1, 2)).reshape(4, n, 2)
+    H = np.stack([g[0] - g[1], g[2] - g[3]], axis=1) / (2 * h)
+    return (H + H.transpose(0, 2, 1)) / 2
+
+
+def positive_definite_inverses(H, min_eigenvalue=1e-3):
+    """
+    Inverts a batch of symmetric 2 x 2 matrices after shifting the ones whose
+    smaller eigenvalue is below min_eigenvalue up to it, so the Newton
+    direction is always a descent direction.
+    """
+    a, b, d = H[:, 0, 0], H[:, 0, 1], H[:, 1, 1]
+    smaller = (a + d) / 2 - np.sqrt(((a - d) / 2) ** 2 + b ** 2)
+    shift = np.maximum(min_eigenvalue - smaller, 0)
+    a, d = a + shift, d + shift
+    det = a * d - b * b
+    return np.stack([np.stack([d, -b], -1), np.stack([-b, a], -1)], -2) / det[:, None, None]
+
+
+def second_order_minimize(f, dfdx, dfdy, points, x_range, y_range, n_it=100, method="newton",
+                          hessian=None, h=1e-5, reuse_radius=0.0, max_step=0.5, c=1e-4, max_backtracks=30):
+    """
+    Minimizes f from every row of an (N, 2) array of start points at once with
+    Newton's method (method="newton") or BFGS (method="bfgs"), both with a
+    vectorized backtracking line search on steps of at most max_step. A point
+    stops when both partial derivatives are below 0.001 (converged), when it
+    leaves the ranges (exited) or after n_it steps, as in
+    gradient_descent_two_variables.
+
+    For Newton's method the Hessians come from hessian(x, y) (an (N, 2, 2)
+    array) or, if None, from finite differences of dfdx and dfdy with step h.
+    Their inverses are cached per point and only recomputed once a point has
+    moved more than reuse_radius from where they were evaluated, so a positive
+    reuse_radius saves Hessian evaluations where they change slowly.
+
+    Returns the final points, the number of steps, the converged and exited
+    masks and a dict with the numbers of evaluations of f, of the gradient and
+    of the Hessian (counted per point).
+    """
+    if method not in ("newton", "bfgs"):
+        raise ValueError(f"method must be 'newton' or 'bfgs', not {method!r}")
+    points = np.array(points, dtype=float).reshape(-1, 2)
+    n = len(points)
+    iterations = np.zeros(n, dtype=int)
+    converged = np.zeros(n, dtype=bool)
+    exited = np.zeros(n, dtype=bool)
+    f_values = f(points[:, 0], points[:, 1])
+    evals = {"f": n, "gradient": 0, "hessian": 0}
+
+    # Newton: cached inverse Hessians and where they were evaluated. BFGS: inverse Hessian approximations.
+    inverses = np.tile(np.eye(2), (n, 1, 1))
+    anchors = np.full((n, 2), np.nan)
+    previous_gradients = np.zeros((n, 2))
+    steps = np.zeros((n, 2))
+
+    active = np.arange(n)
+    for i in range(n_it + 1):
+        p = points[active]
+        g = gradients(dfdx, dfdy, p)
+        evals["gradient"] += len(active)
+
+        small = np.all(np.abs(g) < 0.001, axis=1)
+        inside = ((p[:, 0] >= x_range[0]) & (p[:, 0] <= x_range[1]) &
+                  (p[:, 1] >= y_range[0]) & (p[:, 1] <= y_range[1]))
+        converged[active[small & inside]] = True
+        exited[active[~inside]] = True
+        keep = ~small & inside
+        if i == n_it or not keep.any():
+            break
+        active, p, g = active[keep], p[keep], g[keep]
+
+        if method == "newton":
+            stale = ~(np.linalg.norm(p - anchors[active], axis=1) <= reuse_radius)
+            if stale.any():
+                refresh = active[stale]
+                H = (finite_difference_hessians(dfdx, dfdy, points[refresh], h) if hessian is None
+                     else np.broadcast_to(hessian(points[refresh, 0], points[refresh, 1]), (len(refresh), 2, 2)))
+                evals["hessian"] += len(refresh)
+                evals["gradient"] += 4 * len(refresh) if hessian is None else 0
+                inverses[refresh] = positive_definite_inverses(H)
+                anchors[refresh] = points[refresh]
+        elif i > 0:
+            # BFGS update of the inverse Hessian approximations from the last step.
+            s = steps[active]
+            y = g - previous_gradients[active]
+            sy = np.einsum("ij,ij->i", s, y)
+            update = sy > 1e-10
+            idx, s, y, sy = active[update], s[update], y[update], sy[update]
+            B = inverses[idx]
+            By = np.einsum("ijk,ik->ij", B, y)
+            yBy = np.einsum("ij,ij->i", y, By)
+            inverses[idx] = (
+                B
+                + ((sy + yBy) / sy ** 2)[:, None, None] * s[:, :, None] * s[:, None, :]
+                - (By[:, :, None] * s[:, None, :] + s[:, :, None] * By[:, None, :]) / sy[:, None, None]
+            )
+
+        direction = -np.einsum("ijk,ik->ij", inverses[active], g)
+        slope = np.einsum("ij,ij->i", g, direction)
+
+        # Vectorized backtracking: each point halves its own step until f decreases enough.
+        f_p = f_values[active]
+        f_new = np.empty(len(active))
+        t = np.minimum(1, max_step / np.maximum(np.linalg.norm(direction, axis=1), 1e-300))
+        searching = np.arange(len(active))
+        for attempt in range(max_backtracks):
+            candidate = p[searching] + t[searching, None] * direction[searching]
+            with np.errstate(all="ignore"):
+                f_new[searching] = f(candidate[:, 0], candidate[:, 1])
+            evals["f"] += len(searching)
+            accepted = f_new[searching] <= f_p[searching] + c * t[searching] * slope[searching]
+            searching = searching[~accepted]
+            # Points out of tries keep the last step tried, whose f value is in f_new.
+            if len(searching) == 0 or attempt == max_backtracks - 1:
+                break
+            t[searching] /= 2
+
+        previous_gradients[active] = g
+        steps[active] = t[:, None] * direction
+        points[active] = p + steps[active]
+        f_values[active] = f_new
+        iterations[active] += 1
+
+    return points, iterations, converged, exited, evals
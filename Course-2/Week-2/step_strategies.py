@@ -0,0 +1,145 @@
+import numpy as np
+
+
+class step_strategy:
+    """
+    Base class of the step strategies. An instance can be passed to the
+    gradient descent classes of w2_tools in place of gd, so it is called like
+    gd: step(dfdx, x, learning_rate, num_iterations) for one variable and
+    step(dfdx, dfdy, x, y, learning_rate, num_iterations) for two. Subclasses
+    implement step on a point stored as an array. State such as momentum is
+    kept between calls until reset, and the steps and the evaluations of f and
+    of the gradient are counted.
+    """
+    def __init__(self, f=None):
+        self.f = f
+        self.reset()
+
+    def reset(self):
+        ''' forgets the state and the counts, called when gradient descent restarts from a new point '''
+        self.state = {}
+        self.n_steps = 0
+        self.n_f_evals = 0
+        self.n_grad_evals = 0
+
+    def count_f(self, f):
+        def counted(point):
+            self.n_f_evals += 1
+            return f(*point)
+        return counted
+
+    def count_grad(self, *partials):
+        def counted(point):
+            self.n_grad_evals += 1
+            return np.array([partial(*point) for partial in partials], dtype=float)
+        return counted
+
+    def __call__(self, *args):
+        if len(args) == 4:
+            dfdx, x, learning_rate, num_iterations = args
+            partials, point = (dfdx,), np.array([x], dtype=float)
+        else:
+            dfdx, dfdy, x, y, learning_rate, num_iterations = args
+            partials, point = (dfdx, dfdy), np.array([x, y], dtype=float)
+        f = None if self.f is None else self.count_f(self.f)
+        grad = self.count_grad(*partials)
+
+        for _ in range(num_iterations):
+            point = self.step(f, grad, point, learning_rate)
+            self.n_steps += 1
+        return point[0] if len(point) == 1 else tuple(point)
+
+    def step(self, f, grad, x, learning_rate):
+        raise NotImplementedError
+
+
+class plain(step_strategy):
+    """ the fixed learning rate step of the labs """
+    def step(self, f, grad, x, learning_rate):
+        return x - learning_rate * grad(x)
+
+
+class armijo(step_strategy):
+    """
+    Backtracking line search: starts from twice the last accepted step size
+    (learning_rate on the first step) and shrinks it by shrink until f
+    decreases by at least c times the decrease predicted by the gradient.
+    Points where f is not defined count as no decrease.
+    """
+    def __init__(self, f, c=1e-4, shrink=0.5, max_backtracks=50):
+        self.c = c
+        self.shrink = shrink
+        self.max_backtracks = max_backtracks
+        super().__init__(f)
+
+    def step(self, f, grad, x, learning_rate):
+        g = grad(x)
+        f_x = f(x)
+        t = 2 * self.state.get("t", learning_rate / 2)
+        for attempt in range(self.max_backtracks):
+            with np.errstate(all="ignore"):
+                if f(x - t * g) <= f_x - self.c * t * (g @ g):
+                    break
+            # Out of tries, the last step tested is taken.
+            if attempt < self.max_backtracks - 1:
+                t *= self.shrink
+        self.state["t"] = t
+        return x - t * g
+
+
+class momentum(step_strategy):
+    """ heavy-ball momentum, or Nesterov's accelerated gradient with nesterov=True """
+    def __init__(self, beta=0.9, nesterov=False):
+        self.beta = beta
+        self.nesterov = nesterov
+        super().__init__()
+
+    def step(self, f, grad, x, learning_rate):
+        v = self.state.get("v", np.zeros_like(x))
+        g = grad(x + self.beta * v) if self.nesterov else grad(x)
+        v = self.beta * v - learning_rate * g
+        self.state["v"] = v
+        return x + v
+
+
+class adam(step_strategy):
+    """ Adam, with learning_rate as the step size """
+    def __init__(self, beta_1=0.9, beta_2=0.999, epsilon=1e-8):
+        self.beta_1 = beta_1
+        self.beta_2 = beta_2
+        self.epsilon = epsilon
+        super().__init__()
+
+    def step(self, f, grad, x, learning_rate):
+        g = grad(x)
+        t = self.state.get("t", 0) + 1
+        m = self.beta_1 * self.state.get("m", 0) + (1 - self.beta_1) * g
+        v = self.beta_2 * self.state.get("v", 0) + (1 - self.beta_2) * g * g
+        self.state.update(t=t, m=m, v=v)
+        m_hat = m / (1 - self.beta_1 ** t)
+        v_hat = v / (1 - self.beta_2 ** t)
+        return x - learning_rate * m_hat / (np.sqrt(v_hat) + self.epsilon)
+
+
+class newton(step_strategy):
+    """
+    Newton's method for one variable. The second derivative is d2fdx2 or, if
+    None, a central difference of dfdx with step h. Where it is not positive
+    the step falls back to a plain gradient step, so maxima are not targeted.
+    """
+    def __init__(self, d2fdx2=None, h=1e-5):
+        self.d2fdx2 = d2fdx2
+        self.h = h
+        super().__init__()
+
+    def step(self, f, grad, x, learning_rate):
+        if len(x) != 1:
+            raise ValueError("newton only supports functions of one variable")
+        g = grad(x)
+        if self.d2fdx2 is None:
+            curvature = (grad(x + self.h) - grad(x - self.h)) / (2 * self.h)
+        else:
+            curvature = np.array([self.d2fdx2(x[0])])
+        if curvature[0] > 0:
+            return x - g / curvature
+        return x - learning_rate * g
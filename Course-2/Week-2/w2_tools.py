@@ -1,10 +1,14 @@
 import time
+from collections import OrderedDict
 import numpy as np
+import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.widgets import Button
-from matplotlib.patches import FancyArrowPatch
+from matplotlib.collections import LineCollection
 from matplotlib.gridspec import GridSpec
 from IPython.display import display, clear_output
+from redraw import artist_updater, set_scatter3d_offsets
+from autodiff import derivative, partial_derivatives
 
 
 def plot_f(x_range, y_range, f, ox_position):
@@ -32,9 +36,120 @@ def plot_f(x_range, y_range, f, ox_position):
     return fig, ax
 
 
+class frame_scheduler:
+    """ picks which steps of a finished run are rendered and paces them in time """
+    def __init__(self, max_frames=50, fps=20, fast_forward=False):
+        ''' at most max_frames frames per run and fps frames per second, fast_forward renders only the result '''
+        self.max_frames = max_frames
+        self.fps = fps
+        self.fast_forward = fast_forward
+        self.last_frame = None
+
+    def frames(self, n_steps):
+        ''' step numbers (1 to n_steps) to render, always including the last one '''
+        if n_steps == 0:
+            return np.array([], dtype=int)
+        if self.fast_forward:
+            return np.array([n_steps])
+        n_frames = n_steps if self.max_frames is None else min(n_steps, self.max_frames)
+        return np.unique(np.linspace(1, n_steps, n_frames).round().astype(int))
+
+    def wait(self):
+        ''' sleeps until the next frame is due '''
+        now = time.monotonic()
+        if self.fps and self.last_frame is not None:
+            time.sleep(max(0.0, self.last_frame + 1 / self.fps - now))
+        self.last_frame = time.monotonic()
+
+
+def gd_trajectory_one_variable(gd, dfdx, x_0, lr, n_it, x_range):
+    '''
+    Runs gd from x_0 with the stopping rules of gradient_descent_one_variable
+    and returns the visited points: the first step is only taken if the point
+    it lands on keeps going (derivative of at least 0.00001, not left of the
+    range), every later one if the current point does, at most n_it steps.
+    gd is called once per step, so step strategies with state can be used and
+    are reset first.
+    '''
+    def keeps_going(x):
+        return abs(dfdx(x)) >= 0.00001 and x >= x_range[0]
+
+    if hasattr(gd, "reset"):
+        gd.reset()
+    trajectory = [x_0]
+    x_0_new = gd(dfdx, x_0, lr, 1)
+    if n_it >= 1 and keeps_going(x_0_new):
+        trajectory.append(x_0_new)
+        while len(trajectory) <= n_it and keeps_going(trajectory[-1]):
+            trajectory.append(gd(dfdx, trajectory[-1], lr, 1))
+    return np.array(trajectory)
+
+
+def gd_trajectory_two_variables(gd, dfdx, dfdy, x_0, y_0, lr, n_it, x_range, y_range):
+    '''
+    Two variable version of gd_trajectory_one_variable with the stopping rules of
+    gradient_descent_two_variables (partial derivatives below 0.001, inside both
+    ranges). Returns the visited points as an (n, 2) array and whether the run
+    converged, judged like the plot does.
+    '''
+    def small_gradient(x, y):
+        return abs(dfdx(x, y)) < 0.001 and abs(dfdy(x, y)) < 0.001
+
+    def inside(x, y):
+        return x_range[0] <= x <= x_range[1] and y_range[0] <= y <= y_range[1]
+
+    if hasattr(gd, "reset"):
+        gd.reset()
+    trajectory = [(x_0, y_0)]
+    last = gd(dfdx, dfdy, x_0, y_0, lr, 1)
+    if n_it >= 1 and not small_gradient(*last) and inside(*last):
+        trajectory.append(last)
+        while len(trajectory) <= n_it and not small_gradient(*last) and inside(*last):
+            last = gd(dfdx, dfdy, *last, lr, 1)
+            trajectory.append(last)
+    return np.array(trajectory, dtype=float), small_gradient(*last) and inside(*trajectory[-1])
+
+
+def compare_step_strategies(strategies, f, x_0, lr, n_it, x_range, y_0=None, y_range=None,
+                            dfdx=None, dfdy=None):
+    '''
+    Runs each step strategy (name -> strategy or gd function) from the same
+    start with the stopping rules of the interactive plots and returns a
+    DataFrame with the steps taken, whether the run converged, the final point
+    and the evaluations of f and of the gradient the strategy made. Passing
+    y_0 and y_range runs the two variable version. Missing derivatives are
+    derived from f automatically.
+    '''
+    rows = []
+    for name, gd in strategies.items():
+        if y_0 is None:
+            dfdx_ = derivative(f) if dfdx is None else dfdx
+            trajectory = gd_trajectory_one_variable(gd, dfdx_, x_0, lr, n_it, x_range)
+            x = trajectory[-1]
+            converged = abs(dfdx_(x)) < 0.00001 and x >= x_range[0]
+            final = {"x": x, "f": f(x)}
+        else:
+            auto_dfdx, auto_dfdy = partial_derivatives(f)
+            trajectory, converged = gd_trajectory_two_variables(
+                gd, auto_dfdx if dfdx is None else dfdx, auto_dfdy if dfdy is None else dfdy,
+                x_0, y_0, lr, n_it, x_range, y_range
+            )
+            final = {"x": trajectory[-1, 0], "y": trajectory[-1, 1], "f": f(*trajectory[-1])}
+        rows.append({
+            "strategy": name,
+            "iterations": len(trajectory) - 1,
+            "converged": converged,
+            **final,
+            "f_evals": getattr(gd, "n_f_evals", None),
+            "grad_evals": getattr(gd, "n_grad_evals", None),
+        })
+    return pd.DataFrame(rows).set_index("strategy")
+
+
 class gradient_descent_one_variable:
-    """ class to run one interactive plot """
-    def __init__(self, x_range, y_range, f, dfdx, gd, n_it, lr, x_0, ox_position, t_position):
+    """ class to run one interactive plot, dfdx=None differentiates f automatically """
+    def __init__(self, x_range, y_range, f, dfdx, gd, n_it, lr, x_0, ox_position, t_position,
+                 max_frames=50, fps=20, fast_forward=False):
         x = np.linspace(*x_range, 100)
         fig, ax = plot_f(x_range, y_range, f, ox_position)
         
@@ -43,7 +158,7 @@ class gradient_descent_one_variable:
         self.ax = ax
         self.x = x
         self.f = f
-        self.dfdx = dfdx
+        self.dfdx = derivative(f) if dfdx is None else dfdx
         self.gd = gd
         self.n_it = n_it
         self.lr = lr
@@ -52,9 +167,11 @@ class gradient_descent_one_variable:
         self.i = 0
         self.ox_position = ox_position
         self.t_position = t_position
-        
+        self.scheduler = frame_scheduler(max_frames, fps, fast_forward)
+
         self.update_plot_point(firsttime=True)
         self.path = path(self.x_0, self.ax, self.ox_position)  # initialize an empty path, avoids existance check
+        self.updater.add(*self.path.path_items)
         
         time.sleep(0.2)
         clear_output(wait=True)
@@ -75,82 +192,127 @@ class gradient_descent_one_variable:
         
     def update_plot_point(self, firsttime=False):
        
-        # Remove items and re-add them on plot.
-        if not firsttime:
-            for artist in self.p_items:
-                artist.remove()
-        
-        a = self.ax.scatter(self.x_0, self.f(self.x_0), marker='o', s=100, color='r', zorder=10)
-        b = self.ax.scatter(self.x_0, self.ox_position, marker='o', s=100, color='k', zorder=10)
-        c = self.ax.hlines(self.f(self.x_0), 0, self.x_0, lw=2, ls='dotted', color='k')
-        d = self.ax.vlines(self.x_0, self.ox_position, self.f(self.x_0), lw=2, ls='dotted', color='k')
-        t_it = self.ax.annotate(f"Iteration #${self.i}$", xy=(self.t_position[0], self.t_position[1]), 
-                                xytext=(4,4), textcoords='offset points', size=10)
-        t_x_0 = self.ax.annotate(f"$x_0 = {self.x_0:0.4f}$", xy=(self.t_position[0], self.t_position[1]-1), 
-                                 xytext=(4,4), textcoords='offset points', size=10)
-        t_f = self.ax.annotate(f"$f\\,\\left(x_0\\right) = {self.f(self.x_0):0.2f}$", 
-                               xy=(self.t_position[0], self.t_position[1]-2), xytext=(4,4), 
-                              textcoords='offset points', size=10)
-        t_dfdx = self.ax.annotate(f"$f\\,'\\left(x_0\\right) = {self.dfdx(self.x_0):0.4f}$", 
-                                  xy=(self.t_position[0], self.t_position[1]-3), 
-                                  xytext=(4,4), textcoords='offset points', size=10)
-        
-        self.p_items = [a, b, c, d, t_it, t_x_0, t_f, t_dfdx]
-        self.fig.canvas.draw()
+        # Create the items once, afterwards only their data changes.
+        if firsttime:
+            a = self.ax.scatter(self.x_0, self.f(self.x_0), marker='o', s=100, color='r', zorder=10)
+            b = self.ax.scatter(self.x_0, self.ox_position, marker='o', s=100, color='k', zorder=10)
+            c = self.ax.hlines(self.f(self.x_0), 0, self.x_0, lw=2, ls='dotted', color='k')
+            d = self.ax.vlines(self.x_0, self.ox_position, self.f(self.x_0), lw=2, ls='dotted', color='k')
+            t_it = self.ax.annotate("", xy=(self.t_position[0], self.t_position[1]), 
+                                    xytext=(4,4), textcoords='offset points', size=10)
+            t_x_0 = self.ax.annotate("", xy=(self.t_position[0], self.t_position[1]-1), 
+                                     xytext=(4,4), textcoords='offset points', size=10)
+            t_f = self.ax.annotate("", xy=(self.t_position[0], self.t_position[1]-2), xytext=(4,4), 
+                                  textcoords='offset points', size=10)
+            t_dfdx = self.ax.annotate("", xy=(self.t_position[0], self.t_position[1]-3), 
+                                      xytext=(4,4), textcoords='offset points', size=10)
+            t_res = self.ax.annotate("", xy=(self.t_position[0], self.t_position[1]-4), 
+                                     xytext=(4,4), textcoords='offset points', size=10)
+            t_instruction = self.ax.text(0.3,0.95,"", size=10, color="r", transform=self.ax.transAxes)
+            self.p_items = [a, b, c, d, t_it, t_x_0, t_f, t_dfdx, t_res, t_instruction]
+            self.updater = artist_updater(self.fig)
+            self.updater.add(*self.p_items)
+
+        a, b, c, d, t_it, t_x_0, t_f, t_dfdx, t_res, t_instruction = self.p_items
+        f_x_0 = self.f(self.x_0)
+        a.set_offsets([[self.x_0, f_x_0]])
+        b.set_offsets([[self.x_0, self.ox_position]])
+        c.set_segments([[(0, f_x_0), (self.x_0, f_x_0)]])
+        d.set_segments([[(self.x_0, self.ox_position), (self.x_0, f_x_0)]])
+        t_it.set_text(f"Iteration #${self.i}$")
+        t_x_0.set_text(f"$x_0 = {self.x_0:0.4f}$")
+        t_f.set_text(f"$f\\,\\left(x_0\\right) = {f_x_0:0.2f}$")
+        t_dfdx.set_text(f"$f\\,'\\left(x_0\\right) = {self.dfdx(self.x_0):0.4f}$")
+        t_res.set_text("")
+        t_instruction.set_text("")
+        self.updater.update()
             
+    def optimize(self):
+        ''' runs gradient descent from x_0 to the end and returns the visited points '''
+        return gd_trajectory_one_variable(self.gd, self.dfdx, self.x_0, self.lr, self.n_it, self.x_range)
+
     def run_gd(self):
-        self.i = 1
-        x_0_new = self.gd(self.dfdx, self.x_0, self.lr, 1)
-        while (self.i <= self.n_it and abs(self.dfdx(x_0_new)) >= 0.00001 and x_0_new >= self.x_range[0]):
-            x_0_new = self.gd(self.dfdx, self.x_0, self.lr, 1)
-            self.path.add_path_item(x_0_new, self.f)
-            self.x_0 = x_0_new
-            time.sleep(0.05)
+        # Optimize at full speed first, then render only the scheduled frames.
+        self.trajectory = self.optimize()
+        step = 0
+        for frame in self.scheduler.frames(len(self.trajectory) - 1):
+            for x_0_new in self.trajectory[step + 1:frame + 1]:
+                self.path.add_path_item(x_0_new, self.f)
+            step = frame
+            self.x_0 = self.trajectory[frame]
+            self.i = frame
+            self.scheduler.wait()
             self.update_plot_point()
             clear_output(wait=True)
             display(self.fig)
-            self.i += 1
+        self.i = len(self.trajectory)
 
+        t_res, t_instruction = self.p_items[-2:]
         if abs(self.dfdx(self.x_0)) >= 0.00001 or self.x_0 < self.x_range[0] or self.x_0 < self.x_range[0]:
-            t_res = self.ax.annotate("Has Not Converged", xy=(self.t_position[0], self.t_position[1]-4), 
-                             xytext=(4,4), textcoords='offset points', size=10)
+            t_res.set_text("Has Not Converged")
         else:
-            t_res = self.ax.annotate("Converged", xy=(self.t_position[0], self.t_position[1]-4), 
-                             xytext=(4,4), textcoords='offset points', size=10)   
-        t_instruction = self.ax.text(0.3,0.95,"[Click on the plot to choose initial point]", 
-                                     size=10, color="r", transform=self.ax.transAxes)        
-        self.p_items.append(t_res)
-        self.p_items.append(t_instruction)
+            t_res.set_text("Converged")
+        t_instruction.set_text("[Click on the plot to choose initial point]")
+        self.updater.update()
         # Clear last time at the end, so there is no duplicate with the cell output.
         clear_output(wait=True)
 #         plt.close()
 
 
+class trajectory:
+    ''' growable buffer of the points visited during gradient descent '''
+    def __init__(self, point, capacity=64):
+        ''' point is the start of the trajectory '''
+        self.buffer = np.empty((capacity, len(point)))
+        self.n = 0
+        self.append(point)
+
+    def append(self, point):
+        if self.n == len(self.buffer):
+            self.buffer = np.concatenate([self.buffer, np.empty_like(self.buffer)])
+        self.buffer[self.n] = point
+        self.n += 1
+
+    def re_init(self, point):
+        self.n = 0
+        self.append(point)
+
+    @property
+    def points(self):
+        return self.buffer[:self.n]
+
+
 class path:
     ''' tracks paths during gradient descent on the plot '''
     def __init__(self, x_0, ax, ox_position):
         ''' x_0 at start of path '''
-        self.path_items = []
-        self.x_0 = x_0
         self.ax = ax
         self.ox_position = ox_position
+        self.trajectory = trajectory([x_0, np.nan])
+        self.steps = LineCollection([], color='r', lw=3, zorder=9)
+        self.visited = self.ax.scatter([], [], facecolors='none', edgecolors='r', ls='dotted', s=100, zorder=10)
+        self.ax.add_collection(self.steps)
+        self.path_items = [self.steps, self.visited]
 
     def re_init(self, x_0):
-        for artist in self.path_items:
-            artist.remove()
-        self.path_items = []
-        self.x_0 = x_0
+        self.trajectory.re_init([x_0, np.nan])
+        self.draw()
 
     def add_path_item(self, x_0, f):
-        a = FancyArrowPatch(
-            posA=(self.x_0, self.ox_position), posB=(x_0, self.ox_position), color='r',
-            arrowstyle='simple, head_width=5, head_length=10, tail_width=1.0',
-        )
-        b = self.ax.scatter(self.x_0, f(self.x_0), facecolors='none', edgecolors='r', ls='dotted', s=100, zorder=10)
-        self.ax.add_artist(a)
-        self.path_items.append(a)
-        self.path_items.append(b)
-        self.x_0 = x_0
+        # The previous point gets its f value when it is left, like the circles of the original path.
+        points = self.trajectory.points
+        points[-1, 1] = f(points[-1, 0])
+        self.trajectory.append([x_0, np.nan])
+        self.draw()
+
+    def draw(self):
+        points = self.trajectory.points
+        x = points[:, 0]
+        self.steps.set_segments(np.stack([
+            np.column_stack([x[:-1], np.full(len(x) - 1, self.ox_position)]),
+            np.column_stack([x[1:], np.full(len(x) - 1, self.ox_position)]),
+        ], axis=1))
+        self.visited.set_offsets(points[:-1])
 
 
 # +
@@ -172,6 +334,12 @@ def dfdx_example_3(x,y):
 def dfdy_example_3(x,y):
     return 0.1/3*(x-6)*x**2*y*(4-y)
 
+def hessian_example_3(x,y):
+    # f = 85 + 0.1*p(x)*q(y) with p = (x-6)*x**2 and q = -1/9*y**3 + 2/3*y**2
+    p, dp, d2p = (x-6)*x**2, 3*x**2-12*x, 6*x-12
+    q, dq, d2q = -1/9*y**3+2/3*y**2, -1/3*y**2+4/3*y, -2/3*y+4/3
+    return 0.1*np.stack([np.stack([d2p*q, dp*dq], -1), np.stack([dp*dq, p*d2q], -1)], -2)
+
 
 # +
 def f_example_4(x,y):
@@ -189,10 +357,94 @@ def dfdy_example_4(x,y):
             -2*2*(y-1.5)*2/(1+2*((x-3)**2)+2*(y-1.5)**2)**2 +\
             -0.5*2*(y-4)*3/(1+.5*((x-3.5)**2)+0.5*(y-4)**2)**2)
 
+def hessian_example_4(x,y):
+    # f = 10 - sum of a/(c + b*r) with r the squared distance to the bump's centre
+    H_xx, H_xy, H_yy = 0, 0, 0
+    for a, b, c, x_c, y_c in [(10, 3, 3, .5, .5), (2, 2, 1, 3, 1.5), (3, .5, 1, 3.5, 4)]:
+        d_x, d_y = x-x_c, y-y_c
+        u = c + b*(d_x**2 + d_y**2)
+        outer, diagonal = 8*a*b**2/u**3, 2*a*b/u**2
+        H_xx = H_xx - outer*d_x**2 + diagonal
+        H_xy = H_xy - outer*d_x*d_y
+        H_yy = H_yy - outer*d_y**2 + diagonal
+    return np.stack([np.stack([H_xx, H_xy], -1), np.stack([H_xy, H_yy], -1)], -2)
+
 
 # -
 
-def plot_f_cont_and_surf(x_range, y_range, z_range, f, cmap, view):
+# Evaluated surface grids, keyed by (f, x_range, y_range, resolution, adaptive, tol, max_resolution).
+# Least recently used grids are evicted beyond SURFACE_GRIDS_MAX_ENTRIES grids or SURFACE_GRIDS_MAX_BYTES.
+SURFACE_GRIDS = OrderedDict()
+SURFACE_GRIDS_MAX_ENTRIES = 8
+SURFACE_GRIDS_MAX_BYTES = 64 * 2**20
+
+
+def _evict_surface_grids():
+    # The most recently used grid is always kept, even if it is over budget alone.
+    while len(SURFACE_GRIDS) > 1 and (
+        len(SURFACE_GRIDS) > SURFACE_GRIDS_MAX_ENTRIES
+        or sum(a.nbytes for grid in SURFACE_GRIDS.values() for a in grid) > SURFACE_GRIDS_MAX_BYTES
+    ):
+        SURFACE_GRIDS.popitem(last=False)
+
+
+def _refine_columns(f, x, y, Z, tol, max_points, candidates):
+    '''
+    Evaluates f on the midpoints of the candidate intervals between neighbouring
+    grid columns and inserts the ones where linear interpolation along x is off
+    by more than tol, worst first and keeping at most max_points columns.
+    Returns x, Z and the candidate mask for the next pass (the halves of split intervals).
+    '''
+    tested = np.flatnonzero(candidates)
+    mid = (x[tested] + x[tested + 1]) / 2
+    Z_mid = f(*np.meshgrid(mid, y))
+    error = np.max(np.abs(Z_mid - (Z[:, tested] + Z[:, tested + 1]) / 2), axis=0)
+    split = np.flatnonzero(error > tol)
+    split = np.sort(split[np.argsort(error[split])[::-1][:max(max_points - len(x), 0)]])
+    x = np.insert(x, tested[split] + 1, mid[split])
+    Z = np.insert(Z, tested[split] + 1, Z_mid[:, split], axis=1)
+    candidates = np.zeros(len(x) - 1, dtype=bool)
+    candidates[tested[split] + np.arange(len(split))] = True
+    candidates[tested[split] + np.arange(len(split)) + 1] = True
+    return x, Z, candidates
+
+
+def surface_grid(f, x_range, y_range, resolution=51, adaptive=False, tol=1e-4, max_resolution=500):
+    '''
+    Returns X, Y, f(X, Y) on a resolution x resolution grid, evaluated once per
+    (f, ranges, resolution) and shared by later calls while it stays in the
+    LRU cache SURFACE_GRIDS. With adaptive=True the
+    grid starts at resolution points per axis and keeps inserting grid lines
+    between neighbours where linear interpolation is off by more than tol
+    (relative to the range of f), up to max_resolution lines per axis, so only
+    regions of high curvature get the fine spacing.
+    '''
+    key = (f, tuple(x_range), tuple(y_range), resolution, adaptive, tol, max_resolution)
+    if key in SURFACE_GRIDS:
+        SURFACE_GRIDS.move_to_end(key)
+    else:
+        x = np.linspace(*x_range, resolution)
+        y = np.linspace(*y_range, resolution)
+        Z = f(*np.meshgrid(x, y))
+        if adaptive:
+            tol = tol * np.ptp(Z)
+            x_candidates = np.ones(len(x) - 1, dtype=bool)
+            y_candidates = np.ones(len(y) - 1, dtype=bool)
+            while x_candidates.any() or y_candidates.any():
+                x, Z, x_candidates = _refine_columns(f, x, y, Z, tol, max_resolution, x_candidates)
+                y, Z_T, y_candidates = _refine_columns(
+                    lambda b, a: f(a, b), y, x, Z.T, tol, max_resolution, y_candidates
+                )
+                Z = Z_T.T
+        X, Y = np.meshgrid(x, y)
+        for array in (X, Y, Z):
+            array.flags.writeable = False
+        SURFACE_GRIDS[key] = (X, Y, Z)
+        _evict_surface_grids()
+    return SURFACE_GRIDS[key]
+
+
+def plot_f_cont_and_surf(x_range, y_range, z_range, f, cmap, view, resolution=51, adaptive=False):
     
     fig = plt.figure( figsize=(10,5))
     fig.canvas.toolbar_visible = False
@@ -203,11 +455,9 @@ def plot_f_cont_and_surf(x_range, y_range, z_range, f, cmap, view):
     axc = fig.add_subplot(gs[0, 0])
     axs = fig.add_subplot(gs[0, 1],  projection='3d')
     
-    x = np.linspace(*x_range, 51)
-    y = np.linspace(*y_range, 51)
-    X,Y = np.meshgrid(x,y)
+    X, Y, Z = surface_grid(f, x_range, y_range, resolution, adaptive)
     
-    cont = axc.contour(X, Y, f(X, Y), cmap=cmap, levels=18, linewidths=2, alpha=0.7)
+    cont = axc.contour(X, Y, Z, cmap=cmap, levels=18, linewidths=2, alpha=0.7)
     axc.set_xlabel('$x$')
     axc.set_ylabel('$y$')
     axc.set_xlim(*x_range)
@@ -215,7 +465,7 @@ def plot_f_cont_and_surf(x_range, y_range, z_range, f, cmap, view):
     axc.set_aspect("equal")
     axc.autoscale(enable=False)
     
-    surf = axs.plot_surface(X,Y, f(X,Y), cmap=cmap, 
+    surf = axs.plot_surface(X, Y, Z, cmap=cmap, 
                     antialiased=True, cstride=1, rstride=1, alpha=0.69)
     axs.set_xlabel('$x$')
     axs.set_ylabel('$y$')
@@ -230,7 +480,7 @@ def plot_f_cont_and_surf(x_range, y_range, z_range, f, cmap, view):
 
 
 class gradient_descent_two_variables:
-    """ class to run one interactive plot """
+    """ class to run one interactive plot, a dfdx or dfdy of None is derived from f automatically """
     def __init__(self, x_range, y_range, z_range, f, dfdx, dfdy, gd, n_it, lr, x_0, y_0, 
                  t_position, t_space, instr_position, cmap, view):
         
@@ -245,8 +495,9 @@ class gradient_descent_two_variables:
         self.x = x
         self.y = y
         self.f = f
-        self.dfdx = dfdx
-        self.dfdy = dfdy
+        auto_dfdx, auto_dfdy = partial_derivatives(f)
+        self.dfdx = auto_dfdx if dfdx is None else dfdx
+        self.dfdy = auto_dfdy if dfdy is None else dfdy
         self.gd = gd
         self.n_it = n_it
         self.lr = lr
@@ -261,6 +512,7 @@ class gradient_descent_two_variables:
         
         self.update_plot_point(firsttime=True)
         self.path = path_2(self.x_0, self.y_0, self.axc, self.axs)  # initialize an empty path, avoids existance check
+        self.updater.add(*self.path.path_items)
         
         time.sleep(0.2)
         clear_output(wait=True)
@@ -283,56 +535,59 @@ class gradient_descent_two_variables:
 
     def update_plot_point(self, firsttime=False):
        
-        # Remove items and re-add them on plot.
-        if not firsttime:
-            for artist in self.p_items:
-                artist.remove()
-        
-        a = self.axc.scatter(self.x_0, self.y_0, marker='o', s=100, color='k', zorder=10)
-        b = self.axc.hlines(self.y_0, self.axc.get_xlim()[0], self.x_0, lw=2, ls='dotted', color='k')
-        c = self.axc.vlines(self.x_0, self.axc.get_ylim()[0], self.y_0, lw=2, ls='dotted', color='k')
-        d = self.axs.scatter3D(self.x_0, self.y_0, self.f(self.x_0, self.y_0), s=100, color='r', zorder=10)
-        t_it = self.axs.text(self.t_position[0], self.t_position[1], self.t_position[2],
-                             f"Iteration #${self.i}$", size=10, zorder=20)
-        t_x_y = self.axs.text(self.t_position[0], self.t_position[1], self.t_position[2]-self.t_space,
-                             f"$x_0, y_0 = {self.x_0:0.2f}, {self.y_0:0.2f}$", size=10, zorder=20)
-        t_f = self.axs.text(self.t_position[0], self.t_position[1], self.t_position[2]-self.t_space*2,
-                             f"$f\\,\\left(x_0, y_0\\right) = {self.f(self.x_0, self.y_0):0.2f}$", size=10, zorder=20)
-        t_dfdx = self.axs.text(self.t_position[0], self.t_position[1], self.t_position[2]-self.t_space*3,
-                             f"$f\\,'_x\\left(x_0, y_0\\right) = {self.dfdx(self.x_0, self.y_0):0.2f}$", size=10, zorder=20)
-        t_dfdy = self.axs.text(self.t_position[0], self.t_position[1], self.t_position[2]-self.t_space*4,
-                             f"$f\\,'_y\\left(x_0, y_0\\right) = {self.dfdy(self.x_0, self.y_0):0.2f}$", size=10, zorder=20)
-        self.p_items = [a, b, c, d, t_it, t_x_y, t_f, t_dfdx, t_dfdy]
-        self.fig.canvas.draw()
+        # Create the items once, afterwards only their data changes.
+        if firsttime:
+            a = self.axc.scatter(self.x_0, self.y_0, marker='o', s=100, color='k', zorder=10)
+            b = self.axc.hlines(self.y_0, self.axc.get_xlim()[0], self.x_0, lw=2, ls='dotted', color='k')
+            c = self.axc.vlines(self.x_0, self.axc.get_ylim()[0], self.y_0, lw=2, ls='dotted', color='k')
+            d = self.axs.scatter3D(self.x_0, self.y_0, self.f(self.x_0, self.y_0), s=100, color='r', zorder=10)
+            texts = [
+                self.axs.text(self.t_position[0], self.t_position[1], self.t_position[2]-self.t_space*i,
+                              "", size=10, zorder=20)
+                for i in range(6)
+            ]
+            t_instruction = self.axs.text(*self.instr_position, "", size=10, color="r", transform=self.axs.transAxes)
+            self.p_items = [a, b, c, d, *texts, t_instruction]
+            self.updater = artist_updater(self.fig)
+            self.updater.add(*self.p_items)
+
+        a, b, c, d, t_it, t_x_y, t_f, t_dfdx, t_dfdy, t_res, t_instruction = self.p_items
+        f_x_y = self.f(self.x_0, self.y_0)
+        a.set_offsets([[self.x_0, self.y_0]])
+        b.set_segments([[(self.axc.get_xlim()[0], self.y_0), (self.x_0, self.y_0)]])
+        c.set_segments([[(self.x_0, self.axc.get_ylim()[0]), (self.x_0, self.y_0)]])
+        set_scatter3d_offsets(d, self.x_0, self.y_0, f_x_y)
+        t_it.set_text(f"Iteration #${self.i}$")
+        t_x_y.set_text(f"$x_0, y_0 = {self.x_0:0.2f}, {self.y_0:0.2f}$")
+        t_f.set_text(f"$f\\,\\left(x_0, y_0\\right) = {f_x_y:0.2f}$")
+        t_dfdx.set_text(f"$f\\,'_x\\left(x_0, y_0\\right) = {self.dfdx(self.x_0, self.y_0):0.2f}$")
+        t_dfdy.set_text(f"$f\\,'_y\\left(x_0, y_0\\right) = {self.dfdy(self.x_0, self.y_0):0.2f}$")
+        t_res.set_text("")
+        t_instruction.set_text("")
+        self.updater.update()
         
     def run_gd(self):
-        self.i = 1
-        x_0_new, y_0_new = self.gd(self.dfdx, self.dfdy, self.x_0, self.y_0, self.lr, 1)
-        
-        while (self.i <= self.n_it and 
-               (abs(self.dfdx(x_0_new, y_0_new)) >= 0.001 or abs(self.dfdy(x_0_new, y_0_new)) >= 0.001) and 
-               x_0_new >= self.x_range[0] and x_0_new <= self.x_range[1] and 
-               y_0_new >= self.y_range[0] and y_0_new <= self.y_range[1]):
-            x_0_new, y_0_new = self.gd(self.dfdx, self.dfdy, self.x_0, self.y_0, self.lr, 1)
+        self.trajectory, converged = gd_trajectory_two_variables(
+            self.gd, self.dfdx, self.dfdy, self.x_0, self.y_0, self.lr, self.n_it, self.x_range, self.y_range
+        )
+        for i, (x_0_new, y_0_new) in enumerate(self.trajectory[1:], start=1):
             self.path.add_path_item(x_0_new, y_0_new, self.f)
             self.x_0 = x_0_new
             self.y_0 = y_0_new
+            self.i = i
             time.sleep(0.05)
             self.update_plot_point()
             clear_output(wait=True)
             display(self.fig)
-            self.i += 1
+        self.i = len(self.trajectory)
 
-        if abs(self.dfdx(x_0_new, y_0_new)) >= 0.001 or abs(self.dfdy(x_0_new, y_0_new)) >= 0.001 or self.x_0 < self.x_range[0] or self.x_0 > self.x_range[1] or self.y_0 < self.y_range[0] or self.y_0 > self.y_range[1]:
-            t_res = self.axs.text(self.t_position[0], self.t_position[1], self.t_position[2]-self.t_space*5, 
-                                  "Has Not Converged", size=10, zorder=20)
+        t_res, t_instruction = self.p_items[-2:]
+        if not converged:
+            t_res.set_text("Has Not Converged")
         else:
-            t_res = self.axs.text(self.t_position[0], self.t_position[1], self.t_position[2]-self.t_space*5, 
-                                  "Converged", size=10, zorder=20)
-        t_instruction = self.axs.text(*self.instr_position, "[Click on the contour plot to choose initial point]", 
-                                     size=10, color="r", transform=self.axs.transAxes)        
-        self.p_items.append(t_res)
-        self.p_items.append(t_instruction)
+            t_res.set_text("Converged")
+        t_instruction.set_text("[Click on the contour plot to choose initial point]")
+        self.updater.update()
         # Clear last time at the end, so there is no duplicate with the cell output.
         clear_output(wait=True)
 
@@ -341,28 +596,90 @@ class path_2:
     ''' tracks paths during gradient descent on contour and surface plots '''
     def __init__(self, x_0, y_0, axc, axs):
         ''' x_0, y_0 at start of path '''
-        self.path_items = []
-        self.x_0 = x_0
-        self.y_0 = y_0
         self.axc = axc
         self.axs = axs
+        self.trajectory = trajectory([x_0, y_0, np.nan])
+        self.steps = LineCollection([], color='r', lw=3, zorder=9)
+        self.visited = self.axs.scatter3D([], [], [], facecolors='none', edgecolors='r', ls='dotted', s=100, zorder=10)
+        self.axc.add_collection(self.steps)
+        self.path_items = [self.steps, self.visited]
 
     def re_init(self, x_0, y_0):
-        for artist in self.path_items:
-            artist.remove()
-        self.path_items = []
-        self.x_0 = x_0
-        self.y_0 = y_0
+        self.trajectory.re_init([x_0, y_0, np.nan])
+        self.draw()
 
     def add_path_item(self, x_0, y_0, f):
-        a = FancyArrowPatch(
-            posA=(self.x_0, self.y_0), posB=(x_0, y_0), color='r',
-            arrowstyle='simple, head_width=5, head_length=10, tail_width=1.0',
-        )
-        b = self.axs.scatter3D(self.x_0, self.y_0, f(self.x_0, self.y_0), 
-                               facecolors='none', edgecolors='r', ls='dotted', s=100, zorder=10)
-        self.axc.add_artist(a)
-        self.path_items.append(a)
-        self.path_items.append(b)
-        self.x_0 = x_0
-        self.y_0 = y_0
+        points = self.trajectory.points
+        points[-1, 2] = f(points[-1, 0], points[-1, 1])
+        self.trajectory.append([x_0, y_0, np.nan])
+        self.draw()
+
+    def draw(self):
+        points = self.trajectory.points
+        self.steps.set_segments(np.stack([points[:-1, :2], points[1:, :2]], axis=1))
+        set_scatter3d_offsets(self.visited, *points[:-1].T)
+
+
+def multi_start_gd(dfdx, dfdy, points, lr, n_it, x_range, y_range):
+    '''
+    Runs gradient descent from every row of an (N, 2) array of start points at
+    once, with the stopping rules of gradient_descent_two_variables.run_gd: a
+    point stops at the first point where both partial derivatives are below
+    0.001 (converged) or that is out of the ranges (exited), or after n_it
+    steps. dfdx and dfdy have to accept arrays.
+    Returns the final points, the number of steps and the converged and exited masks.
+    '''
+    points = np.array(points, dtype=float).reshape(-1, 2)
+    iterations = np.zeros(len(points), dtype=int)
+
+    def step(p):
+        return p - lr * np.column_stack([dfdx(p[:, 0], p[:, 1]), dfdy(p[:, 0], p[:, 1])])
+
+    def keeps_going(p):
+        return ((np.abs(dfdx(p[:, 0], p[:, 1])) >= 0.001) | (np.abs(dfdy(p[:, 0], p[:, 1])) >= 0.001)) & \
+               (p[:, 0] >= x_range[0]) & (p[:, 0] <= x_range[1]) & \
+               (p[:, 1] >= y_range[0]) & (p[:, 1] <= y_range[1])
+
+    # Like run_gd, the first step is only taken if the point it lands on keeps going,
+    # every later point is checked after the step to it.
+    last = step(points)
+    active = np.flatnonzero(keeps_going(last))
+    for _ in range(n_it):
+        if len(active) == 0:
+            break
+        points[active] = step(points[active])
+        last[active] = points[active]
+        iterations[active] += 1
+        active = active[keeps_going(points[active])]
+
+    converged = (np.abs(dfdx(last[:, 0], last[:, 1])) < 0.001) & (np.abs(dfdy(last[:, 0], last[:, 1])) < 0.001)
+    exited = ((points[:, 0] < x_range[0]) | (points[:, 0] > x_range[1]) |
+              (points[:, 1] < y_range[0]) | (points[:, 1] > y_range[1]))
+    return points, iterations, converged & ~exited, exited
+
+
+def basin_map(dfdx, dfdy, x_range, y_range, lr, n_it, resolution=100, tol=0.05):
+    '''
+    Runs multi_start_gd from a resolution x resolution grid of start points and
+    labels each start point with the minimum it converged to (-1 if it did not).
+    Endpoints closer than tol are treated as the same minimum.
+    Returns the grid X, Y, the labels with the grid's shape and the minima as a (K, 2) array.
+    '''
+    x = np.linspace(*x_range, resolution)
+    y = np.linspace(*y_range, resolution)
+    X, Y = np.meshgrid(x, y)
+    points, _, converged, _ = multi_start_gd(
+        dfdx, dfdy, np.column_stack([X.ravel(), Y.ravel()]), lr, n_it, x_range, y_range
+    )
+
+    labels = np.full(len(points), -1)
+    minima = []
+    unlabeled = converged.copy()
+    while unlabeled.any():
+        minimum = points[np.argmax(unlabeled)]
+        close = unlabeled & (np.linalg.norm(points - minimum, axis=1) < tol)
+        labels[close] = len(minima)
+        minima.append(points[close].mean(axis=0))
+        unlabeled &= ~close
+
+    return X, Y, labels.reshape(X.shape), np.array(minima).reshape(-1, 2)
@@ -480,3 +480,287 @@ def test_gradient_descent(target_gradient_descent, input_dEdm, input_dEdb, input
     else:
         print("\033[92m", successful_cases, " Tests passed")
         print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_linear_regression_fit(target_fit):
+    successful_cases = 0
+    failed_cases = []
+
+    rng = np.random.default_rng(0)
+    X_single = rng.uniform(0, 300, 1000)
+    X_multi = rng.normal(1000, 10, (1000, 3))
+    noise = rng.normal(0, 1, 1000)
+    y_single = 0.05 * X_single + 7 + noise
+    y_multi = X_multi @ np.array([2.0, -1.0, 0.5]) - 3 + noise
+    coefficients = np.linalg.lstsq(np.column_stack([X_multi, np.ones(1000)]), y_multi, rcond=None)[0]
+
+    # Solvers and chunk sizes that do not divide the number of rows, so chunks get merged.
+    test_cases = [
+        {
+            "name": "polyfit_check",
+            "input": {"X": X_single, "y": y_single, "method": "cholesky", "chunk_size": 1_000_000},
+            "expected": tuple(np.polyfit(X_single, y_single, 1)),
+        },
+        {
+            "name": "normal_chunked_check",
+            "input": {"X": X_single, "y": y_single, "method": "normal", "chunk_size": 77},
+            "expected": tuple(np.polyfit(X_single, y_single, 1)),
+        },
+        {
+            "name": "qr_chunked_check",
+            "input": {"X": X_single, "y": y_single, "method": "qr", "chunk_size": 130},
+            "expected": tuple(np.polyfit(X_single, y_single, 1)),
+        },
+        {
+            "name": "lstsq_multi_feature_check",
+            "input": {"X": X_multi, "y": y_multi, "method": "cholesky", "chunk_size": 333},
+            "expected": (coefficients[:3], coefficients[3]),
+        },
+    ]
+
+    for test_case in test_cases:
+        result_w, result_b = target_fit(**test_case["input"])
+        expected_w, expected_b = test_case["expected"]
+
+        try:
+            assert np.shape(result_w) == np.shape(expected_w)
+            assert np.allclose(result_w, expected_w, rtol=1e-7) and np.allclose(result_b, expected_b, rtol=1e-7)
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": test_case["expected"],
+                    "got": (result_w, result_b),
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong output (w, b) of fit with method = {test_case['input']['method']}, chunk_size = {test_case['input']['chunk_size']}. \n\tExpected: \n{failed_cases[-1].get('expected')}\n\tGot: \n{failed_cases[-1].get('got')}"
+            )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_read_csv_statistics(target_read_csv_statistics, target_fit_statistics):
+    successful_cases = 0
+    failed_cases = []
+
+    adv = pd.read_csv("data/tvmarketing.csv")
+    X, Y = adv["TV"].to_numpy(), adv["Sales"].to_numpy()
+    whole = target_fit_statistics(X, Y)
+
+    test_cases = [
+        {
+            "name": "default_check",
+            "input": {"chunksize": 100_000},
+        },
+        {
+            "name": "chunked_check",
+            "input": {"chunksize": 7},
+        },
+    ]
+
+    for test_case in test_cases:
+        result = target_read_csv_statistics("data/tvmarketing.csv", "TV", "Sales", **test_case["input"])
+
+        # The statistics merged over chunks match the ones of all rows at once.
+        try:
+            assert result.n == whole.n == len(adv)
+            assert np.allclose(result.mean, whole.mean) and np.allclose(result.S, whole.S)
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": (whole.n, whole.mean, whole.S),
+                    "got": (result.n, result.mean, result.S),
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong statistics (n, mean, S) read with chunksize = {test_case['input']['chunksize']}. \n\tExpected: \n{failed_cases[-1].get('expected')}\n\tGot: \n{failed_cases[-1].get('got')}"
+            )
+
+        try:
+            assert np.allclose(result.solve(), np.polyfit(X, Y, 1))
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": tuple(np.polyfit(X, Y, 1)),
+                    "got": result.solve(),
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong output (m, b) of solve for chunksize = {test_case['input']['chunksize']}. \n\tExpected: \n{failed_cases[-1].get('expected')}\n\tGot: \n{failed_cases[-1].get('got')}"
+            )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_gradient_descent_fit(target_gradient_descent_fit, input_X_norm, input_Y_norm):
+    successful_cases = 0
+    failed_cases = []
+
+    # The cases of test_gradient_descent and test_partial_derivatives.
+    test_cases = [
+        {
+            "name": "default_check",
+            "input": {
+                "w": 0, 
+                "b": 0,
+                "learning_rate": 0.001,
+                "num_iterations": 1000,
+            },
+            "expected": {
+                "m": 0.49460408269589484,
+                "b": -1.367306268207353e-16,
+            }
+        },
+        {
+            "name": "extra_check",
+            "input": {
+                "w": 1,
+                "b": 5,
+                "learning_rate": 0.01,
+                "num_iterations": 10,
+            },
+            "expected": {
+                "m": 0.9791767513915026,
+                "b": 4.521910375044022,
+            }
+        },
+        # One step with learning_rate 1 moves (m, b) by minus the gradients of test_partial_derivatives.
+        {
+            "name": "default_gradient_check",
+            "input": {
+                "w": 0, 
+                "b": 0,
+                "learning_rate": 1,
+                "num_iterations": 1,
+            },
+            "expected": {
+                "m": 0 - -0.7822244248616065,
+                "b": 0 - 1.687538997430238e-16,
+            }
+        },
+        {
+            "name": "extra_gradient_check",
+            "input": {
+                "w": 1,
+                "b": 5,
+                "learning_rate": 1,
+                "num_iterations": 1,
+            },
+            "expected": {
+                "m": 1 - 0.21777557513839416,
+                "b": 5 - 5.000000000000001,
+            }
+        },
+    ]
+
+    for test_case in test_cases:
+        result_m, result_b = target_gradient_descent_fit(input_X_norm, input_Y_norm, **test_case["input"])
+
+        try:
+            assert np.allclose(result_m, test_case["expected"]["m"]) and np.allclose(result_b, test_case["expected"]["b"])
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": (test_case["expected"]["m"], test_case["expected"]["b"]),
+                    "got": (result_m, result_b),
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong output (m, b) of gradient_descent_fit.\nm = {test_case['input']['w']}, b = {test_case['input']['b']}, learning_rate = {test_case['input']['learning_rate']}, num_iterations = {test_case['input']['num_iterations']}. \n\tExpected: \n{failed_cases[-1].get('expected')}\n\tGot: \n{failed_cases[-1].get('got')}"
+            )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_statistics_gradients(target_read_csv_statistics):
+    successful_cases = 0
+    failed_cases = []
+
+    # The cases of test_partial_derivatives, on the normalized statistics of the whole file.
+    test_cases = [
+        {
+            "name": "default_check",
+            "input": {
+                "m": 0, 
+                "b": 0,
+            },
+            "expected": {
+                "dEdm": -0.7822244248616065,
+                "dEdb": 1.687538997430238e-16,
+            }
+        },
+        {
+            "name": "extra_check",
+            "input": {
+                "m": 1,
+                "b": 5,
+            },
+            "expected": {
+                "dEdm": 0.21777557513839416,
+                "dEdb": 5.000000000000001,
+            }
+        },
+    ]
+
+    model = target_read_csv_statistics("data/tvmarketing.csv", "TV", "Sales", chunksize=50).normalized()
+
+    for test_case in test_cases:
+        result_dEdm, result_dEdb = model.gradients(test_case["input"]["m"], test_case["input"]["b"])
+
+        try:
+            assert np.allclose(result_dEdm, test_case["expected"]["dEdm"])
+            successful_cases += 1
+
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": test_case["expected"]["dEdm"],
+                    "got": result_dEdm,
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong output of dEdm for m = {test_case['input']['m']}, b = {test_case['input']['b']}. \n\tExpected: \n{failed_cases[-1].get('expected')}\n\tGot: \n{failed_cases[-1].get('got')}"
+            )
+
+        try:
+            assert np.allclose(result_dEdb, test_case["expected"]["dEdb"])
+            successful_cases += 1
+
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": test_case["expected"]["dEdb"],
+                    "got": result_dEdb,
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong output of dEdb for m = {test_case['input']['m']}, b = {test_case['input']['b']}. \n\tExpected: \n{failed_cases[-1].get('expected')}\n\tGot: \n{failed_cases[-1].get('got')}"
+            )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
@@ -0,0 +1,185 @@
+"""
+Headless benchmarks for the Course-2 optimization helpers, run with the shared
+benchmark_harness.
+
+- derivatives: the hand-written ones of the w2_tools examples against the
+  automatic differentiation of autodiff.py
+- multi-start minimization: plain gradient descent against Newton's method
+  and BFGS from second_order.py, with the mean number of iterations
+- linear regression: the closed form solvers of linear_regression.py against
+  gradient descent on the rows, on the statistics and on a streamed CSV
+
+Inputs are generated with fixed seeds. Every run reports throughput and peak
+traced memory.
+
+    python benchmarks.py                          # default scales
+    python benchmarks.py --full                   # up to 1e7 points
+    python benchmarks.py --save-baseline base.json
+    python benchmarks.py --baseline base.json     # exits with 1 on regressions
+"""
+import atexit
+import os
+import sys
+import tempfile
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+import matplotlib
+
+matplotlib.use("Agg")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.dirname(HERE))
+from benchmark_harness import load_module, main
+
+w2_tools = load_module("c2_w2_tools", os.path.join(HERE, "Week-2/w2_tools.py"))
+w2_autodiff = load_module("c2_w2_autodiff", os.path.join(HERE, "Week-2/autodiff.py"))
+w2_second_order = load_module("c2_w2_second_order", os.path.join(HERE, "Week-2/second_order.py"))
+w2_linear_regression = load_module("c2_w2_linear_regression", os.path.join(HERE, "Week-2/linear_regression.py"))
+
+
+@lru_cache(maxsize=4)
+def random_points(n_points, seed=0):
+    """ fixed random points in (0.1, 5), generated once so only the derivatives are timed """
+    rng = np.random.default_rng(seed)
+    return rng.uniform(0.1, 5, n_points), rng.uniform(0.1, 5, n_points)
+
+
+def bench_hand_derivative(example):
+    def bench(n_points):
+        if example == 2:
+            w2_tools.dfdx_example_2(random_points(n_points)[0])
+        else:
+            x, y = random_points(n_points)
+            getattr(w2_tools, f"dfdx_example_{example}")(x, y)
+            getattr(w2_tools, f"dfdy_example_{example}")(x, y)
+        return n_points
+    return bench
+
+
+def bench_autodiff(example):
+    f = getattr(w2_tools, f"f_example_{example}")
+    df = w2_autodiff.derivative(f) if example == 2 else w2_autodiff.gradient(f)
+
+    def bench(n_points):
+        if example == 2:
+            df(random_points(n_points)[0])
+        else:
+            df(*random_points(n_points))
+        return n_points
+    return bench
+
+
+# Learning rates of the two variable gradient descent lab.
+LEARNING_RATES = {3: 0.25, 4: 0.2}
+
+
+def start_points(n_points, seed=0):
+    return np.column_stack(random_points(n_points, seed)) * 0.8 + 0.5
+
+
+def bench_multi_start_gd(example):
+    dfdx = getattr(w2_tools, f"dfdx_example_{example}")
+    dfdy = getattr(w2_tools, f"dfdy_example_{example}")
+
+    def bench(n_points):
+        _, iterations, _, _ = w2_tools.multi_start_gd(
+            dfdx, dfdy, start_points(n_points), LEARNING_RATES[example], 1000, [0, 5], [0, 5]
+        )
+        return n_points, {"iterations": iterations.mean()}
+    return bench
+
+
+def bench_second_order(example, method):
+    f = getattr(w2_tools, f"f_example_{example}")
+    dfdx = getattr(w2_tools, f"dfdx_example_{example}")
+    dfdy = getattr(w2_tools, f"dfdy_example_{example}")
+    hessian = getattr(w2_tools, f"hessian_example_{example}") if method == "newton" else None
+
+    def bench(n_points):
+        _, iterations, _, _, _ = w2_second_order.second_order_minimize(
+            f, dfdx, dfdy, start_points(n_points), [0, 5], [0, 5], n_it=1000, method=method, hessian=hessian
+        )
+        return n_points, {"iterations": iterations.mean()}
+    return bench
+
+
+@lru_cache(maxsize=1)
+def regression_rows(n_rows, n_features=3, seed=0):
+    """ fixed synthetic rows of y = X w + b plus noise, with X offset from zero like the TV budgets """
+    rng = np.random.default_rng(seed)
+    X = rng.normal(100, 30, (n_rows, n_features))
+    y = X @ np.arange(1, n_features + 1) + 5 + rng.normal(0, 1, n_rows)
+    return X, y
+
+
+def bench_regression(method):
+    def bench(n_rows):
+        X, y = regression_rows(n_rows)
+        if method == "gd":
+            # Gradient descent needs standardized features to converge at a fixed learning rate.
+            X = (X - X.mean(axis=0)) / X.std(axis=0)
+            w2_linear_regression.gradient_descent_fit(X, y, learning_rate=0.5, num_iterations=100)
+        elif method == "gd_statistics":
+            model = w2_linear_regression.fit_statistics(X, y).normalized()
+            model.gradient_descent(learning_rate=0.5, num_iterations=100)
+        else:
+            w2_linear_regression.fit(X, y, method)
+        return n_rows
+    bench.prepare = regression_rows
+    return bench
+
+
+@lru_cache(maxsize=1)
+def regression_csv(n_rows):
+    """ regression_rows written once to a temporary CSV, removed at exit """
+    X, y = regression_rows(n_rows)
+    df = pd.DataFrame(X, columns=[f"x_{i}" for i in range(X.shape[1])]).assign(y=y)
+    fd, path = tempfile.mkstemp(suffix=".csv")
+    os.close(fd)
+    atexit.register(os.remove, path)
+    df.to_csv(path, index=False)
+    return path, list(df.columns[:-1])
+
+
+def bench_csv_statistics(n_rows):
+    path, x_columns = regression_csv(n_rows)
+    model = w2_linear_regression.read_csv_statistics(path, x_columns, "y").normalized()
+    model.gradient_descent(learning_rate=0.5, num_iterations=100)
+    return n_rows
+
+
+bench_csv_statistics.prepare = regression_csv
+
+
+# name -> (function(scale) -> number of units processed (and extra results), unit, default scales, full scales)
+BENCHMARKS = {}
+for example in (2, 3, 4):
+    BENCHMARKS[f"hand/example_{example}"] = (
+        bench_hand_derivative(example), "points", [10_000, 1_000_000], [10_000, 1_000_000, 10_000_000]
+    )
+    BENCHMARKS[f"autodiff/example_{example}"] = (
+        bench_autodiff(example), "points", [10_000, 1_000_000], [10_000, 1_000_000, 10_000_000]
+    )
+for example in (3, 4):
+    BENCHMARKS[f"multi_start_gd/example_{example}"] = (
+        bench_multi_start_gd(example), "starts", [1_000, 100_000], [1_000, 100_000, 1_000_000]
+    )
+    for method in ("newton", "bfgs"):
+        BENCHMARKS[f"{method}/example_{example}"] = (
+            bench_second_order(example, method), "starts", [1_000, 100_000], [1_000, 100_000, 1_000_000]
+        )
+
+for method in ("normal", "cholesky", "qr", "gd", "gd_statistics"):
+    BENCHMARKS[f"regression/{method}"] = (
+        bench_regression(method), "rows", [100_000, 1_000_000], [100_000, 1_000_000, 10_000_000]
+    )
+BENCHMARKS["regression/csv_statistics"] = (
+    bench_csv_statistics, "rows", [100_000, 1_000_000], [100_000, 1_000_000]
+)
+
+
+if __name__ == "__main__":
+    sys.exit(main(BENCHMARKS, __doc__))
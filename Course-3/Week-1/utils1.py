@@ -1,14 +1,69 @@
+import os
+import hashlib
 import numpy as np
+import pandas as pd
 from datetime import timedelta, date
+from scipy.special import gammaln, logsumexp, pdtr
 import matplotlib.pyplot as plt
 import seaborn as sns
 import ipywidgets as widgets
 from ipywidgets import interact_manual
+from redraw import artist_updater, set_stem_data
 
 
 
+# Upper bound on the number of simulated birthdays held in memory at once.
+MAX_CHUNK_ELEMENTS = 2**22
+
+
+def simulate_bday_matches(n_runs, bday_index=0, n_days=365, method="geometric", seed=None):
+    """
+    Simulates n_runs of "add students until one shares my birthday" at once and
+    returns the number of students each run took (the history of your_bday).
+
+    Every student matches with probability 1/n_days, so the waiting time is
+    geometric and method="geometric" samples it directly. method="draws" draws
+    the birthdays themselves in vectorized blocks and finds the first match of
+    every run, which is slower but mirrors add_students step by step.
+
+    Arguments:
+    n_runs -- number of runs to simulate
+    bday_index -- day of the year (0-based) of the birthday to match
+    n_days -- number of days in the year
+    method -- "geometric" or "draws"
+    seed -- seed or numpy Generator
+
+    Returns:
+    history -- integer array of shape (n_runs,)
+    """
+    rng = np.random.default_rng(seed)
+
+    if method == "geometric":
+        return rng.geometric(1 / n_days, size=n_runs)
+
+    if method != "draws":
+        raise ValueError(f"Unknown method {method!r}, use 'geometric' or 'draws'")
+
+    history = np.zeros(n_runs, dtype=int)
+    pending = np.arange(n_runs)
+    # A block of 2 * n_days students matches with probability ~86%.
+    block = 2 * n_days
+    chunk_rows = max(1, MAX_CHUNK_ELEMENTS // block)
+
+    while len(pending):
+        for start in range(0, len(pending), chunk_rows):
+            rows = pending[start : start + chunk_rows]
+            matches = rng.integers(0, n_days, size=(len(rows), block)) == bday_index
+            found = matches.any(axis=1)
+            history[rows] += np.where(found, matches.argmax(axis=1) + 1, block)
+            pending[start : start + len(rows)][found] = -1
+        pending = pending[pending >= 0]
+
+    return history
+
+
 class your_bday:
-    def __init__(self) -> None:
+    def __init__(self, n_batch_runs=100_000) -> None:
         fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
         
         self.fig = fig
@@ -24,11 +79,15 @@ class your_bday:
         self.history = []
         self.bday_picker = widgets.DatePicker(description="Pick your bday", disabled=False, style={'description_width': 'initial'})
         self.start_button = widgets.Button(description="Simulate!")
+        self.n_batch_runs = n_batch_runs
+        self.batch_button = widgets.Button(description=f"Simulate {n_batch_runs:,} runs")
 
         display(self.bday_picker)
         display(self.start_button)
+        display(self.batch_button)
 
         self.start_button.on_click(self.on_button_clicked)
+        self.batch_button.on_click(self.on_batch_button_clicked)
 
     def on_button_clicked(self, b):
         self.match = False
@@ -37,6 +96,20 @@ class your_bday:
         self.get_bday()
         self.add_students()
 
+    def on_batch_button_clicked(self, b):
+        self.get_bday()
+        if not self.bday_str:
+            return
+
+        self.history.extend(simulate_bday_matches(self.n_batch_runs, self.bday_index))
+
+        # Redraw once for the whole batch.
+        self.ax.clear()
+        self.ax.scatter(np.arange(len(self.history)), self.history, s=2)
+        self.ax.set_title(f"Mean number of students to get a match: {np.mean(self.history):.1f}\nNumber of runs: {len(self.history)}")
+        self.ax_hist.clear()
+        sns.histplot(data=self.history, ax=self.ax_hist, bins=16)
+
     def get_bday(self):
         try:
             self.bday_str = self.bday_picker.value.strftime("%m-%d")
@@ -82,10 +155,67 @@ class your_bday:
 big_classroom_sizes = [*range(1,1000, 5)]
 small_classroom_sizes = [*range(1, 80)]
 
-def plot_simulated_probs(sim_probs, class_size):
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache")
+
+
+def exact_shared_bday_probs(class_sizes, n_days=365):
+    """
+    Exact probability that at least two students share a birthday, for every
+    class size at once. The probability of no match, prod (1 - i/n_days) for
+    i < size, is accumulated as a cumulative sum of logs.
+    """
+    class_sizes = np.asarray(class_sizes)
+    n_max = min(class_sizes.max(), n_days)
+    log_no_match = np.concatenate([[0.0], np.cumsum(np.log1p(-np.arange(n_max) / n_days))])
+    probs = 1 - np.exp(log_no_match[np.minimum(class_sizes, n_max)])
+    # With more students than days a match is certain.
+    return np.where(class_sizes > n_days, 1.0, probs)
+
+
+def shared_bday_probs_table(class_sizes=big_classroom_sizes, n_trials=10_000, n_days=365, seed=0, cache_dir=CACHE_DIR):
+    """
+    Exact and simulated probabilities of a shared birthday for every class size.
+
+    The simulation runs n_trials of simulate_first_shared_bday once: a class of
+    size s has a match when the first shared birthday shows up by student s, so
+    the simulated probability for every size is the empirical CDF at s.
+    Tables are cached in cache_dir keyed by (sizes, trials, days, seed); pass
+    cache_dir=None or seed=None to always recompute.
+
+    Returns:
+    df -- DataFrame with columns class_size, exact and simulated
+    """
+    class_sizes = np.asarray(class_sizes)
+    path = None
+    if cache_dir is not None and seed is not None:
+        key = hashlib.sha1(repr((class_sizes.tolist(), n_trials, n_days, seed)).encode()).hexdigest()
+        path = os.path.join(cache_dir, f"shared_bday_probs_{key}.npz")
+        if os.path.exists(path):
+            with np.load(path) as cached:
+                return pd.DataFrame({k: cached[k] for k in cached.files})
+
+    first_match = np.sort(simulate_first_shared_bday(n_trials, n_days=n_days, seed=seed))
+    df = pd.DataFrame(
+        {
+            "class_size": class_sizes,
+            "exact": exact_shared_bday_probs(class_sizes, n_days),
+            "simulated": np.searchsorted(first_match, class_sizes, side="right") / n_trials,
+        }
+    )
+
+    if path is not None:
+        os.makedirs(cache_dir, exist_ok=True)
+        np.savez(path, **{c: df[c].to_numpy() for c in df.columns})
+
+    return df
+
+
+def plot_simulated_probs(sim_probs, class_size, exact_probs=None):
     fig, ax = plt.subplots(1, 1, figsize=(10, 4))
 #     ax.scatter(class_size, sim_probs)
     sns.scatterplot(x=class_size, y=sim_probs, ax=ax, label="simulated probabilities")
+    if exact_probs is not None:
+        ax.plot(class_size, exact_probs, color="black", label="exact probabilities")
     ax.set_ylabel("Simulated Probability")
     ax.set_xlabel("Classroom Size")
     ax.set_title("Probability vs Number of Students")
@@ -95,8 +225,82 @@ def plot_simulated_probs(sim_probs, class_size):
 
     
     
+def simulate_first_shared_bday(
+    n_runs, n_days=365, seed=None, return_bdays=False, probs=None, max_students=None, k=2
+):
+    """
+    Simulates n_runs of "add students until k share a birthday" at once.
+
+    Birthdays are drawn for a block of students per run and the first match of
+    every row is found with one stable sort: the earliest position that is at
+    least the k-th occurrence of its value, i.e. whose value is also found k-1
+    places before it in sorted order. Runs without a match in the block get
+    more students until, at the latest, n_days * (k-1) + 1 students are in the room.
+
+    Arguments:
+    n_runs -- number of runs to simulate
+    n_days -- number of days in the year
+    seed -- seed or numpy Generator
+    return_bdays -- whether to also return the birthdays drawn in every run
+    probs -- probability of every day, None for n_days equiprobable days
+    max_students -- if given, runs stop at this many students and report max_students + 1 without a match
+    k -- number of students sharing a birthday that counts as a match
+
+    Returns:
+    n_students -- integer array of shape (n_runs,), students needed to get a match
+    bdays -- only if return_bdays, list with the birthdays of every run up to the match
+    """
+    rng = np.random.default_rng(seed)
+    if probs is not None:
+        # Non-uniform days are drawn by inverting the cumulative distribution.
+        cdf = np.cumsum(probs)
+        n_days = len(cdf)
+    limit = n_days * (k - 1) + 1
+    if max_students is not None:
+        limit = min(limit, max_students)
+    first_match = np.full(n_runs, limit, dtype=int)
+    draws = [None] * n_runs if return_bdays else None
+
+    pending = np.arange(n_runs)
+    bdays = np.empty((n_runs, 0), dtype=np.int32)
+    width = min(limit, 64)
+
+    while len(pending):
+        size = (len(pending), width - bdays.shape[1])
+        if probs is None:
+            new = rng.integers(0, n_days, size=size, dtype=np.int32)
+        else:
+            new = np.searchsorted(cdf, rng.random(size) * cdf[-1], side="right")
+            new = np.minimum(new, n_days - 1).astype(np.int32)
+        bdays = np.concatenate([bdays, new], axis=1)
+
+        order = np.argsort(bdays, axis=1, kind="stable")
+        sorted_bdays = np.take_along_axis(bdays, order, axis=1)
+        repeated = sorted_bdays[:, k - 1 :] == sorted_bdays[:, : width - k + 1]
+        first = np.where(repeated, order[:, k - 1 :], width).min(axis=1)
+
+        found = first < width
+        first_match[pending[found]] = first[found]
+        if return_bdays:
+            for run, row, j in zip(pending[found], bdays[found], first[found]):
+                draws[run] = row[: j + 1]
+
+        pending, bdays = pending[~found], bdays[~found]
+        if width == limit:
+            # Only reached with max_students, since n_days * (k-1) + 1 students always match.
+            break
+        width = min(limit, 2 * width)
+
+    n_students = first_match + 1
+    return (n_students, draws) if return_bdays else n_students
+
+
 class third_bday_problem:
-    def __init__(self) -> None:
+    def __init__(self, max_frames=None) -> None:
+        """
+        max_frames -- maximum number of intermediate frames drawn per run, None
+                      to draw every student and 0 to draw only the final state
+        """
         fig, axes = plt.subplot_mosaic(
             [["top row", "top row"], ["bottom left", "bottom right"]], figsize=(10, 8)
         )
@@ -142,6 +346,25 @@ class third_bday_problem:
         self.history = []
         self.match_index = None
         self.match_str = None
+        self.max_frames = max_frames
+
+        # Stems are created once and only their data changes between frames.
+        self.match_stems = self.ax.stem(self.x, self.y_match, markerfmt="*")
+        plt.setp(self.match_stems.markerline, color="green")
+        plt.setp(self.match_stems.stemlines, "color", "green")
+        plt.setp(self.match_stems.stemlines, "linestyle", "dotted")
+        self.stems = self.ax.stem(self.x, self.y, markerfmt="o")
+        self.ax.set_xlim(-5, 370)
+        self.ax.set_ylim(0, 1.1)
+
+        self.updater = artist_updater(self.fig)
+        self.updater.add(
+            self.match_stems.markerline,
+            self.match_stems.stemlines,
+            self.stems.markerline,
+            self.stems.stemlines,
+            self.ax.title,
+        )
 
         self.cpoint = self.fig.canvas.mpl_connect("button_press_event", self.on_button_clicked)
 
@@ -152,8 +375,9 @@ class third_bday_problem:
         # self.start_button.on_click(self.on_button_clicked)
 
     def generate_bday(self):
-        gen_bday = np.random.randint(0, 365)
+        self.place_bday(np.random.randint(0, 365))
 
+    def place_bday(self, gen_bday):
         if not np.isnan(self.y[gen_bday]):
             self.match_index = gen_bday
             self.match_str = self.dates[gen_bday]
@@ -168,39 +392,49 @@ class third_bday_problem:
             self.add_students()
 
     def add_students(self):
+        _, (bdays,) = simulate_first_shared_bday(1, seed=np.random.randint(2**31), return_bdays=True)
 
-        while True:
-            if self.match:
-                self.history.append(self.n_students)
-                n_runs = [i for i in range(len(self.history))]
-                self.count_ax.scatter(n_runs, self.history)
-                self.count_ax.set_ylabel("# of students")
-                self.count_ax.set_xlabel("# of simulations")
-
-                month_str = self.month_names[int(self.match_str.split("-")[0]) - 1]
-                day_value = self.match_str.split("-")[1]
-                self.ax.set_title(
-                    f"Match found for {month_str} {day_value}\nIt took {self.n_students} students to get a match"
-                )
-                self.ax_hist.clear()
-                sns.histplot(data=self.history, ax=self.ax_hist, bins="auto")
-                break
+        n = len(bdays)
+        if self.max_frames is None:
+            frames = set(range(1, n + 1))
+        else:
+            frames = set(np.linspace(1, n, min(n, self.max_frames)).astype(int)[:-1])
 
-            self.generate_bday()
+        for gen_bday in bdays:
+            self.place_bday(gen_bday)
             self.n_students += 1
-            self.ax.set_title(f"Number of students: {self.n_students}")
 
-            self.fig.canvas.draw()
-            self.fig.canvas.flush_events()
+            if self.n_students in frames:
+                self.ax.set_title(f"Number of students: {self.n_students}")
+                self.draw_students()
+                self.updater.update()
 
-            if not np.isnan(self.y_match).all():
-                markerline, stemlines, baseline = self.ax.stem(
-                    self.x, self.y_match, markerfmt="*"
-                )
-                plt.setp(markerline, color="green")
-                plt.setp(stemlines, "color", plt.getp(markerline, "color"))
-                plt.setp(stemlines, "linestyle", "dotted")
-            self.ax.stem(self.x, self.y, markerfmt="o")
+        self.draw_students()
+        self.history.append(self.n_students)
+        self.draw_history()
+
+        month_str = self.month_names[int(self.match_str.split("-")[0]) - 1]
+        day_value = self.match_str.split("-")[1]
+        self.ax.set_title(
+            f"Match found for {month_str} {day_value}\nIt took {self.n_students} students to get a match"
+        )
+
+    def add_runs(self, n_runs):
+        """ simulates n_runs headlessly and redraws the run statistics once """
+        self.history.extend(simulate_first_shared_bday(n_runs, seed=np.random.randint(2**31)))
+        self.draw_history()
+
+    def draw_students(self):
+        set_stem_data(self.match_stems, self.y_match)
+        set_stem_data(self.stems, self.y)
+
+    def draw_history(self):
+        self.count_ax.clear()
+        self.count_ax.scatter(np.arange(len(self.history)), self.history, s=2 if len(self.history) > 1000 else None)
+        self.count_ax.set_ylabel("# of students")
+        self.count_ax.set_xlabel("# of simulations")
+        self.ax_hist.clear()
+        sns.histplot(data=self.history, ax=self.ax_hist, bins="auto")
 
     def new_run(self):
         y = np.zeros((365,))
@@ -211,4 +445,127 @@ class third_bday_problem:
         self.y = y
         self.n_students = 0
         self.match = False
-        self.ax.clear()
+        self.ax.set_title("")
+        self.draw_students()
+
+
+def _day_probs(probs, n_days):
+    if probs is None:
+        return np.full(n_days, 1 / n_days), True
+    probs = np.asarray(probs, dtype=float)
+    probs = probs[probs > 0] / probs.sum()
+    return probs, bool(np.allclose(probs, probs[0]))
+
+
+def _poisson_no_match_prob(n_people, probs, k):
+    # Poissonization: day counts become independent Poisson(n * p_d).
+    if n_people < k:
+        return 1.0
+    return np.exp(np.sum(np.log(pdtr(k - 1, n_people * probs))))
+
+
+def _saddlepoint_no_match_prob(n_people, probs, k):
+    """
+    Saddle-point approximation of P(no day has k or more people) =
+    n! [z^n] prod_d sum_{j<k} (p_d z)^j / j!.
+    """
+    # Days with equal probability contribute identical factors, so they are
+    # evaluated once and weighted by their count (a single value when uniform).
+    p, counts = np.unique(probs, return_counts=True)
+    log_p = np.log(p)
+
+    capacity = counts.sum() * (k - 1)
+    if n_people > capacity:
+        return 0.0
+    if n_people == capacity:
+        # Every day holds exactly k-1 people.
+        log_prob = gammaln(n_people + 1) - counts.sum() * gammaln(k) + (k - 1) * counts @ log_p
+        return np.exp(log_prob)
+
+    j = np.arange(k)
+
+    def moments(t):
+        # Per-day truncated Poisson weights for z = e^t, normalized in log space.
+        log_w = j * (log_p[:, None] + t) - gammaln(j + 1)
+        log_f = logsumexp(log_w, axis=1, keepdims=True)
+        w = np.exp(log_w - log_f)
+        mean = w @ j
+        var = w @ j**2 - mean**2
+        return counts @ log_f[:, 0], counts @ mean, counts @ var
+
+    # Safeguarded Newton on mean(t) = n, since d mean / dt = var. Without the
+    # truncation at k-1 the root would be t = log(n), a close starting point.
+    lo, hi = -50 - log_p.max(), 50 - log_p.min()
+    t = np.log(n_people)
+    for _ in range(100):
+        log_f, mean, var = moments(t)
+        if abs(mean - n_people) < 1e-9 * n_people:
+            break
+        if mean < n_people:
+            lo = t
+        else:
+            hi = t
+        t = t - (mean - n_people) / var
+        if not lo < t < hi:
+            t = (lo + hi) / 2
+    log_prob = gammaln(n_people + 1) + log_f - n_people * t - 0.5 * np.log(2 * np.pi * var)
+    return min(1.0, np.exp(log_prob))
+
+
+def generalized_shared_bday_probs(
+    class_sizes, probs=None, n_days=365, k=2, method="auto", n_trials=10_000, seed=None
+):
+    """
+    Probability that at least k people share a birthday, for any number of days
+    (e.g. hash buckets) and a non-uniform distribution of birthdays.
+
+    Methods:
+    "exact" -- cumulative product, only for uniform days and k=2
+    "poisson" -- independent Poisson day counts, cheapest approximation
+    "saddlepoint" -- saddle-point approximation of the exact count, accurate for large spaces
+    "simulation" -- vectorized Monte Carlo: one set of n_trials runs of simulate_first_shared_bday
+                    gives every size through the empirical CDF of the first k-way match
+    "auto" -- exact for equiprobable days and k=2; for 10,000 days or more saddlepoint when the days
+              are equiprobable and poisson otherwise; simulation for smaller spaces
+
+    Arguments:
+    class_sizes -- number of people, scalar or array
+    probs -- probability of every day, None for n_days equiprobable days
+    n_days -- number of days when probs is None
+    k -- number of people sharing a day that counts as a match
+    method -- one of the methods above
+    n_trials -- number of simulated runs, shared by all sizes
+    seed -- seed or numpy Generator for the simulation
+
+    Returns:
+    probs -- array with the probability of a match for every class size
+    """
+    probs, uniform = _day_probs(probs, n_days)
+    sizes = np.atleast_1d(class_sizes).astype(int)
+
+    if method == "auto":
+        if uniform and k == 2:
+            method = "exact"
+        elif len(probs) >= 10_000:
+            # The saddlepoint costs one Newton solve over all days per size unless they are equiprobable.
+            method = "saddlepoint" if uniform else "poisson"
+        else:
+            method = "simulation"
+
+    if method == "exact":
+        if not (uniform and k == 2):
+            raise ValueError("The exact method needs equiprobable days and k=2")
+        result = exact_shared_bday_probs(sizes, len(probs))
+    elif method == "poisson":
+        result = np.array([1 - _poisson_no_match_prob(n, probs, k) for n in sizes])
+    elif method == "saddlepoint":
+        result = np.array([1 - _saddlepoint_no_match_prob(n, probs, k) if n >= k else 0.0 for n in sizes])
+    elif method == "simulation":
+        first_match = np.sort(simulate_first_shared_bday(
+            n_trials, len(probs), seed, probs=None if uniform else probs, max_students=max(sizes.max(), 1), k=k
+        ))
+        result = np.searchsorted(first_match, sizes, side="right") / n_trials
+    else:
+        raise ValueError(f"Unknown method {method!r}")
+
+    return result if np.ndim(class_sizes) else result[0]
@@ -1,8 +1,10 @@
 import numpy as np
+from scipy.stats import norm
 import matplotlib.pyplot as plt
 import seaborn as sns
 import ipywidgets as widgets
 from ipywidgets import interact_manual
+from redraw import artist_updater
 
 
 
@@ -15,31 +17,41 @@ class monty_hall_game:
         self.memory_wins = {"switch": 0, "stay": 0}
         self.memory_games = {"switch": 0, "stay": 0}
         self.games_finished = 0
-        self.start()
-
-        self.cpoint = self.fig.canvas.mpl_connect("button_press_event", self.click_plot)
-
-    def start(self) -> None:
-
-        self.ax.clear()
-        values = [10, 10, 10]
-        door_numbers = ["Door 1", "Door 2", "Door 3"]
 
         self.ax.spines["top"].set_color("none")
         self.ax.spines["right"].set_color("none")
         self.ax.spines["left"].set_color("none")
         self.ax.get_yaxis().set_visible(False)
 
-        self.ax.bar(
-            door_numbers,
-            values,
+        # Doors, prize labels and results are created once and mutated afterwards.
+        self.prize_coordinates = [-0.15, 0.85, 1.85]
+        self.door_bars = self.ax.bar(
+            ["Door 1", "Door 2", "Door 3"],
+            [10, 10, 10],
             color=["brown", "brown", "brown"],
             width=0.6,
             edgecolor=["black", "black", "black"],
         )
-        self.ax.set_title(f"New game started, pick any door.")
+        self.prize_texts = [self.ax.text(x, 5, "", visible=False) for x in self.prize_coordinates]
+        self.results_points = self.results_ax.scatter([0, 1], [np.nan, np.nan], s=350)
+        self.results_ax.set_xticks([0, 1], ["switch", "stay"])
+        self.results_ax.set_xlim(-0.5, 1.5)
+        self.results_ax.set_ylim(0, 1)
 
-        self.prize_coordinates = [-0.15, 0.85, 1.85]
+        self.updater = artist_updater(self.fig)
+        self.updater.add(*self.door_bars, *self.prize_texts, self.ax.title)
+        self.updater.add(self.results_points, self.results_ax.title)
+
+        self.start()
+
+        self.cpoint = self.fig.canvas.mpl_connect("button_press_event", self.click_plot)
+
+    def start(self) -> None:
+
+        self.set_doors(["brown", "brown", "brown"], ["black", "black", "black"], [1, 1, 1])
+        for text in self.prize_texts:
+            text.set_visible(False)
+        self.ax.set_title(f"New game started, pick any door.")
 
         self.doors, self.winner_index = self.init_monty_hall()
         self.prizes = list(map(lambda x: "GOAT" if x == 0 else "CAR", list(self.doors)))
@@ -52,6 +64,17 @@ class monty_hall_game:
         self.game_over = False
         self.won = None
         self.ilegal_move = False
+        self.updater.update()
+
+    def set_doors(self, colors, edge_colors, linewidths):
+        for bar, color, edge_color, linewidth in zip(self.door_bars, colors, edge_colors, linewidths):
+            bar.set_facecolor(color)
+            bar.set_edgecolor(edge_color)
+            bar.set_linewidth(linewidth)
+
+    def show_prize(self, door):
+        self.prize_texts[door].set_text(f"{self.prizes[door]}")
+        self.prize_texts[door].set_visible(True)
 
     def click_plot(self, event):
         
@@ -73,6 +96,8 @@ class monty_hall_game:
             ):
                 self.update_bar_chart()
 
+            self.updater.update()
+
     def first_pick_mtd(self, x_coord):
 
         if (x_coord >= -0.3) and (x_coord <= 0.3):
@@ -111,7 +136,6 @@ class monty_hall_game:
     def update_bar_chart(self):
 
         if self.first_pick:
-            values = [10, 10, 10]
             colors = ["brown", "brown", "brown"]
             edge_colors = ["black", "black", "black"]
             linewidths = [1, 1, 1]
@@ -119,55 +143,26 @@ class monty_hall_game:
             edge_colors[self.choice] = "red"
             linewidths[self.choice] = 5
 
-            door_numbers = ["Door 1", "Door 2", "Door 3"]
             self.opened_door = self.open_door()
-            # values[opened_door] = 0
 
             colors[self.opened_door] = "gray"
 
-            self.ax.clear()
-            self.ax.text(
-                self.prize_coordinates[self.opened_door],
-                5,
-                f"{self.prizes[self.opened_door]}",
-            )
-
-            # self.ax.text(0,10,f"You chose door {self.choice} and host opened door {opened_door}")
-            # self.ax.text(0.4,5,f"{self.doors}")
-            # self.results_ax.bar(door_numbers, values, color = colors,width = 0.6, edgecolor = ['black', 'black', 'black'])
-
-            self.ax.bar(
-                door_numbers,
-                values,
-                color=colors,
-                width=0.6,
-                edgecolor=edge_colors,
-                linewidth=linewidths,
-            )
+            self.set_doors(colors, edge_colors, linewidths)
+            self.show_prize(self.opened_door)
             self.ax.set_title(
                 f"You chose door {self.choice+1} and host opened door {self.opened_door+1}.\nDecide your final door."
             )
             self.first_pick = False
         else:
-            values = [10, 10, 10]
             colors = ["gray", "gray", "gray"]
             colors[self.winner_index] = "green"
             edge_colors = ["black", "black", "black"]
             edge_colors[self.final_choice] = "red"
             linewidths = [1, 1, 1]
             linewidths[self.final_choice] = 5
-            door_numbers = ["Door 1", "Door 2", "Door 3"]
-            self.ax.clear()
+            self.set_doors(colors, edge_colors, linewidths)
             for i in range(3):
-                self.ax.text(self.prize_coordinates[i], 5, f"{self.prizes[i]}")
-            self.ax.bar(
-                door_numbers,
-                values,
-                color=colors,
-                width=0.6,
-                edgecolor=edge_colors,
-                linewidth=linewidths,
-            )
+                self.show_prize(i)
             self.game_over = True
             self.check_if_switch()
             msg = " " if self.switch else " NOT "
@@ -186,19 +181,14 @@ class monty_hall_game:
             self.update_results_chart()
 
     def update_results_chart(self):
-        self.results_ax.clear()
         self.results_ax.set_title(
             f"Games finished: {self.games_finished}\nGames you switched: {self.memory_games['switch']}, Games you stayed: {self.memory_games['stay']}"
         )
-        self.results_ax.scatter(
-            ["switch", "stay"],
-            [
-                self.memory_wins["switch"] / self.memory_games['switch'],
-                self.memory_wins["stay"] / self.memory_games['stay'],
-            ],
-            s=350,
-        )
-        self.results_ax.set_ylim(0, 1)
+        win_rates = [
+            self.memory_wins[strategy] / self.memory_games[strategy] if self.memory_games[strategy] else np.nan
+            for strategy in ("switch", "stay")
+        ]
+        self.results_points.set_offsets(np.column_stack([[0, 1], win_rates]))
 
     def check_if_switch(self):
         self.switch = False if self.choice == self.final_choice else True
@@ -221,15 +211,144 @@ class monty_hall_game:
     
 
 
-def success_rate_plot(f):
-    def _plot(switch, n_iterations):
-        wins = 0
-        # iterations = 1000
+def simulate_win_rate(f, n_iterations, **kwargs):
+    """ plays n_iterations games with f(**kwargs), which returns 1 on a win, and returns the win rate """
+    wins = 0
 
-        for _ in range(n_iterations):
-                wins += f(switch=switch)
+    for _ in range(n_iterations):
+        wins += f(**kwargs)
 
-        win_rate = wins / n_iterations
+    return wins / n_iterations
+
+
+# Upper bound on the number of games simulated at once.
+MAX_CHUNK_ELEMENTS = 2**22
+
+
+def simulate_monty_hall(n_games, switch, n=3, k=1, seed=None, chunk_size=None):
+    """
+    Plays n_games of the generalized Monty Hall game at once with array operations.
+
+    For every game the car door and the first pick are drawn uniformly, the host
+    opens k doors without replacement among the ones that are neither the car nor
+    the pick, and a switching player moves to a random door among the remaining
+    closed ones. The opened doors never need to be drawn: the host never opens
+    the car, so when the first pick is a goat the car is one of the n-k-1 closed
+    doors a switching player chooses from uniformly. Games are played in chunks
+    of chunk_size to bound memory.
+
+    Arguments:
+    n_games -- number of games to play
+    switch -- whether the player switches doors
+    n -- number of doors
+    k -- number of doors opened by the host
+    seed -- seed or numpy Generator
+    chunk_size -- games per chunk, None to bound memory automatically
+
+    Returns:
+    wins -- boolean array of shape (n_games,)
+    """
+    if not (1 <= k <= n-2):
+        raise ValueError('k must be between 1 and n-2, so the Host can leave at least 1 openable door!')
+
+    rng = np.random.default_rng(seed)
+    rows = chunk_size or MAX_CHUNK_ELEMENTS
+    wins = np.empty(n_games, dtype=bool)
+
+    for start in range(0, n_games, rows):
+        m = min(rows, n_games - start)
+        winner = rng.integers(0, n, size=m)
+        choice = rng.integers(0, n, size=m)
+
+        if not switch:
+            # The opened doors don't change the outcome of staying.
+            wins[start:start + m] = choice == winner
+            continue
+
+        # Switch to one of the n-k-1 closed doors other than the first pick, the car being door 0 of them.
+        switch_to_car = rng.integers(0, n - k - 1, size=m) == 0
+        wins[start:start + m] = (choice != winner) & switch_to_car
+
+    return wins
+
+
+def exact_monty_hall_win_rate(switch, n=3, k=1):
+    """
+    Exact win probability of the generalized Monty Hall game.
+
+    Staying wins when the first pick is the car, 1/n. Switching wins when the
+    first pick is a goat, (n-1)/n, and the random switch lands on the car among
+    the n-k-1 remaining closed doors.
+    """
+    if not (1 <= k <= n-2):
+        raise ValueError('k must be between 1 and n-2, so the Host can leave at least 1 openable door!')
+
+    if switch:
+        return (n - 1) / (n * (n - k - 1))
+    return 1 / n
+
+
+def win_rate_confidence_interval(win_rate, n_games, confidence=0.95):
+    """ Wilson score interval (low, high) for a win rate simulated over n_games """
+    z = norm.ppf(1 - (1 - confidence) / 2)
+    denominator = 1 + z**2 / n_games
+    center = (win_rate + z**2 / (2 * n_games)) / denominator
+    half_width = z / denominator * np.sqrt(
+        win_rate * (1 - win_rate) / n_games + z**2 / (4 * n_games**2)
+    )
+    return center - half_width, center + half_width
+
+
+def adaptive_monty_hall(
+    switch,
+    n=3,
+    k=1,
+    target_half_width=0.005,
+    confidence=0.95,
+    batch_size=10_000,
+    max_games=10**7,
+    seed=None,
+):
+    """
+    Simulates games with simulate_monty_hall until the confidence interval of the
+    win rate is narrower than 2 * target_half_width, or max_games are played.
+    After each batch the number of games still needed is estimated from the
+    current win rate, so easy cases (win rates near 0 or 1) stop early.
+
+    Returns:
+    win_rate -- simulated win rate
+    ci -- (low, high) confidence interval
+    n_games -- number of games played
+    """
+    rng = np.random.default_rng(seed)
+    z = norm.ppf(1 - (1 - confidence) / 2)
+    wins, n_games, batch = 0, 0, batch_size
+
+    while True:
+        batch = min(batch, max_games - n_games)
+        wins += simulate_monty_hall(batch, switch, n=n, k=k, seed=rng).sum()
+        n_games += batch
+
+        win_rate = wins / n_games
+        low, high = win_rate_confidence_interval(win_rate, n_games, confidence)
+        if (high - low) / 2 < target_half_width or n_games >= max_games:
+            return win_rate, (low, high), n_games
+
+        needed = z**2 * win_rate * (1 - win_rate) / target_half_width**2
+        batch = max(batch_size, int(needed) - n_games)
+
+
+def success_rate_plot(f, vectorized=False, adaptive=False, target_half_width=0.005):
+    def _plot(switch, n_iterations):
+        if adaptive:
+            # As in _plot_generalized, n_iterations is the maximum number of games.
+            win_rate, _, n_iterations = adaptive_monty_hall(
+                switch, target_half_width=target_half_width, max_games=n_iterations
+            )
+        elif vectorized:
+            win_rate = simulate_monty_hall(n_iterations, switch).mean()
+        else:
+            win_rate = simulate_win_rate(f, n_iterations, switch=switch)
         loss_rate = 1 - win_rate
 
         fig, ax = plt.subplots(1, 1, figsize=(10, 4))
@@ -245,15 +364,22 @@ def success_rate_plot(f):
         plt.show()
         
     def _plot_generalized(switch, n_iterations, n = 3, k = 1):
-        wins = 0
-        # iterations = 1000
-
-        for _ in range(n_iterations):
-            wins += f(switch=switch, n = n, k = k)
-
-        win_rate = wins / n_iterations
+        if adaptive:
+            # n_iterations is the maximum number of games in adaptive mode.
+            win_rate, ci, n_iterations = adaptive_monty_hall(
+                switch, n=n, k=k, target_half_width=target_half_width, max_games=n_iterations
+            )
+        else:
+            if vectorized:
+                win_rate = simulate_monty_hall(n_iterations, switch, n=n, k=k).mean()
+            else:
+                win_rate = simulate_win_rate(f, n_iterations, switch=switch, n=n, k=k)
+            ci = win_rate_confidence_interval(win_rate, n_iterations)
         loss_rate = 1 - win_rate
 
+        print(f"Exact win rate: {exact_monty_hall_win_rate(switch, n=n, k=k):.4f}")
+        print(f"Simulated win rate: {win_rate:.4f} (95% CI: {ci[0]:.4f} - {ci[1]:.4f})")
+
         fig, ax = plt.subplots(1, 1, figsize=(12, 4))
         ax.pie(
             [win_rate, loss_rate],
@@ -268,8 +394,8 @@ def success_rate_plot(f):
 
 
     n_iterations_selection = widgets.SelectionSlider(
-        options=[1, 10, 100, 1000],
-        value=1,
+        options=[1, 10, 100, 1000] + ([10**4, 10**5, 10**6, 10**7] if vectorized or adaptive else []),
+        value=10**7 if adaptive else 1,
         description="# iterations",
         disabled=False,
         continuous_update=False,
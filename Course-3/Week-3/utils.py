@@ -1,42 +1,438 @@
 import numpy as np
+import pandas as pd
 import seaborn as sns
 import matplotlib.pyplot as plt
-from scipy import stats
 from scipy.stats import norm
+from scipy.signal import fftconvolve
+from scipy.special import ndtri
 import ipywidgets as widgets
 from ipywidgets import interact, interact_manual
+from dataclasses import dataclass, field
+from collections import OrderedDict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+
+
+# Upper bound on the number of bootstrap indices held in memory at once.
+MAX_CHUNK_ELEMENTS = 2**22
+
+
+def _chunk_rows(sample_size, chunk_size=None):
+    if chunk_size is None:
+        chunk_size = max(1, MAX_CHUNK_ELEMENTS // sample_size)
+    return int(chunk_size)
+
+
+def sample_means(data, sample_size, n_samples=10_000, chunk_size=None, seed=None):
+    """
+    Draws n_samples bootstrap samples of size sample_size from data and
+    returns the mean of each one.
+
+    All the indices of a chunk are drawn at once with a numpy Generator and
+    reduced with a single axis-wise mean. The indices are drawn from one
+    stream, so for a fixed seed the result does not depend on chunk_size.
+
+    Arguments:
+    data -- 1D array with the population to sample from
+    sample_size -- number of elements in each sample
+    n_samples -- number of sample means to compute
+    chunk_size -- number of samples drawn per chunk, None to bound memory automatically
+    seed -- seed or numpy Generator, None for fresh entropy
+
+    Returns:
+    means -- array of shape (n_samples,)
+    """
+    data = np.asarray(data)
+    rng = np.random.default_rng(seed)
+    rows = _chunk_rows(sample_size, chunk_size)
+    means = np.empty(n_samples)
+
+    for start in range(0, n_samples, rows):
+        stop = min(start + rows, n_samples)
+        idx = rng.integers(0, len(data), size=(stop - start, sample_size))
+        np.mean(data[idx], axis=1, out=means[start:stop])
+
+    return means
+
+
+@dataclass
+class running_moments:
+    """
+    Running summary of a stream of values.
+
+    Count, mean and sum of squared deviations are merged chunk by chunk with
+    Welford's (Chan's) update, and a fixed-size uniform reservoir of the values
+    is kept for plotting, so memory does not grow with the stream.
+    """
+    reservoir_size: int = 10_000
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0
+    min: float = np.inf
+    max: float = -np.inf
+    reservoir: np.ndarray = field(default_factory=lambda: np.empty(0))
+
+    @property
+    def var(self):
+        return self.m2 / self.count if self.count else np.nan
+
+    @property
+    def std(self):
+        return np.sqrt(self.var)
+
+    def update(self, values, rng):
+        values = np.asarray(values, dtype=float).ravel()
+        k = len(values)
+        if k == 0:
+            return self
+
+        chunk_mean = values.mean()
+        chunk_m2 = np.sum(np.square(values - chunk_mean))
+        total = self.count + k
+        delta = chunk_mean - self.mean
+        self.mean += delta * k / total
+        self.m2 += chunk_m2 + delta**2 * self.count * k / total
+        self.min = min(self.min, values.min())
+        self.max = max(self.max, values.max())
+
+        # Vectorized reservoir sampling (algorithm R).
+        n_fill = min(k, self.reservoir_size - len(self.reservoir))
+        if n_fill > 0:
+            self.reservoir = np.concatenate([self.reservoir, values[:n_fill]])
+        if n_fill < k:
+            positions = np.arange(self.count + n_fill, total)
+            slots = rng.integers(0, positions + 1)
+            keep = slots < self.reservoir_size
+            self.reservoir[slots[keep]] = values[n_fill:][keep]
+
+        self.count = total
+        return self
+
+
+def population_chunks(draw, population_size, chunk_size=1_000_000, seed=None):
+    """
+    Yields a population of population_size values in chunks of at most
+    chunk_size, so that it never has to be held in memory as one array.
+
+    Arguments:
+    draw -- function (rng, size) -> array, e.g. lambda rng, size: rng.normal(10, 5, size)
+    population_size -- total number of values to yield
+    chunk_size -- maximum number of values per chunk
+    seed -- seed or numpy Generator
+    """
+    rng = np.random.default_rng(seed)
+    for start in range(0, population_size, chunk_size):
+        yield draw(rng, min(chunk_size, population_size - start))
+
+
+def streaming_sample_means(
+    data,
+    sample_size,
+    n_samples=None,
+    chunk_size=1_000_000,
+    reservoir_size=10_000,
+    seed=None,
+    population_summary=None,
+):
+    """
+    Streaming variant of sample_means that returns a running_moments summary
+    of the sample means instead of the full means vector. Peak memory is
+    O(chunk_size + reservoir_size).
+
+    If data is an array (e.g. np.memmap) it is resampled with replacement like
+    in sample_means, gathering at most chunk_size elements at a time; n_samples
+    defaults to 10_000. Otherwise data is an iterable of arrays (e.g. from
+    population_chunks) holding i.i.d. draws, and each consecutive block of
+    sample_size values is one sample; n_samples defaults to using the whole stream.
+
+    Arguments:
+    data -- np.ndarray / np.memmap, or iterable of 1D arrays
+    sample_size -- number of elements in each sample
+    n_samples -- number of sample means to compute
+    chunk_size -- maximum number of population values processed at once
+    reservoir_size -- number of sample means kept for plotting
+    seed -- seed or numpy Generator
+    population_summary -- optional running_moments updated with the population values seen
+
+    Returns:
+    summary -- running_moments of the sample means
+    """
+    rng = np.random.default_rng(seed)
+    summary = running_moments(reservoir_size=reservoir_size)
+
+    if isinstance(data, np.ndarray):
+        n_samples = 10_000 if n_samples is None else n_samples
+        rows = max(1, chunk_size // sample_size)
+        for start in range(0, n_samples, rows):
+            idx = rng.integers(0, len(data), size=(min(rows, n_samples - start), sample_size))
+            values = data[idx]
+            summary.update(values.mean(axis=1), rng)
+            if population_summary is not None:
+                population_summary.update(values, rng)
+        return summary
+
+    carry = np.empty(0)
+    for chunk in data:
+        chunk = np.asarray(chunk, dtype=float)
+        if population_summary is not None:
+            population_summary.update(chunk, rng)
+        carry = np.concatenate([carry, chunk])
+        n_full = len(carry) // sample_size
+        if n_samples is not None:
+            n_full = min(n_full, n_samples - summary.count)
+        summary.update(carry[: n_full * sample_size].reshape(n_full, sample_size).mean(axis=1), rng)
+        carry = carry[n_full * sample_size :]
+        if n_samples is not None and summary.count >= n_samples:
+            break
+
+    return summary
+
+
+# distribution -> (draw(rng, size, **params), population sigma(**params))
+CLT_DISTRIBUTIONS = {
+    "gaussian": (
+        lambda rng, size, mu, sigma: rng.normal(mu, sigma, size),
+        lambda mu, sigma: sigma,
+    ),
+    "binomial": (
+        lambda rng, size, n, p: rng.binomial(n, p, size),
+        lambda n, p: np.sqrt(n * p * (1 - p)),
+    ),
+    "poisson": (
+        lambda rng, size, mu: rng.poisson(mu, size),
+        lambda mu: np.sqrt(mu),
+    ),
+}
+
+
+def _means_seed(seed, sample_size):
+    # An integer seed draws the population itself, so the sample means get their own
+    # stream per sample size. None and Generators are used as they are.
+    if seed is None or isinstance(seed, np.random.Generator):
+        return seed
+    return (seed, sample_size)
+
+
+class population_cache:
+    """
+    LRU cache of simulated populations for the interactive CLT widgets.
+
+    Entries are keyed by (distribution, parameters, seed, population size) and
+    hold the population together with the sample means already computed for
+    each sample_size. Least recently used entries are evicted when there are
+    more than max_entries or their arrays take more than max_bytes.
+    """
+    def __init__(self, max_entries=8, max_bytes=256 * 2**20):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()
+
+    @property
+    def nbytes(self):
+        return sum(self._entry_bytes(entry) for entry in self.entries.values())
+
+    def _entry_bytes(self, entry):
+        return entry["population"].nbytes + sum(m.nbytes for m in entry["means"].values())
+
+    def _key(self, distribution, params, seed, population_size):
+        return (distribution, tuple(sorted(params.items())), seed, population_size)
+
+    def _entry(self, distribution, params, seed, population_size):
+        key = self._key(distribution, params, seed, population_size)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+        else:
+            draw, _ = CLT_DISTRIBUTIONS[distribution]
+            population = draw(np.random.default_rng(seed), population_size, **params)
+            self.entries[key] = {"population": population, "means": {}}
+            self._evict()
+        return self.entries[key]
+
+    def _evict(self):
+        # The most recently used entry is always kept, even if it is over budget alone.
+        while len(self.entries) > 1 and (
+            len(self.entries) > self.max_entries or self.nbytes > self.max_bytes
+        ):
+            self.entries.popitem(last=False)
+
+    def population(self, distribution, params, seed=None, population_size=100_000):
+        return self._entry(distribution, params, seed, population_size)["population"]
+
+    def sample_means(self, distribution, params, sample_size, seed=None, population_size=100_000):
+        entry = self._entry(distribution, params, seed, population_size)
+        if sample_size not in entry["means"]:
+            entry["means"][sample_size] = sample_means(
+                entry["population"], sample_size, seed=_means_seed(seed, sample_size)
+            )
+            self._evict()
+        return entry["population"], entry["means"][sample_size]
+
+    def clear(self):
+        self.entries.clear()
+
+
+CLT_CACHE = population_cache()
+
+
+def clt_std_error(sample_means_std, clt_std, tolerance=0.1):
+    """
+    Relative error between the observed std of the sample means and the one
+    predicted by the CLT, and whether it is below tolerance.
+    """
+    std_err = abs(clt_std - sample_means_std) / clt_std
+
+    clt_holds = True if std_err < tolerance else False
+
+    return std_err, clt_holds
+
+
+def fast_kde(data, gridsize=200, cut=3, bw_adjust=1, n_bins=2048):
+    """
+    Gaussian KDE evaluated on a grid, matching sns.kdeplot defaults (Scott's
+    bandwidth, gridsize=200, cut=3). The data are linearly binned onto n_bins
+    points and convolved with the kernel through an FFT, so the cost is
+    O(len(data) + n_bins log n_bins) instead of O(len(data) * gridsize).
+
+    Returns:
+    grid -- array of shape (gridsize,) with the evaluation points
+    density -- array of shape (gridsize,) with the estimated pdf
+    Both are empty when the data have no variance.
+    """
+    data = np.asarray(data, dtype=float)
+    n = len(data)
+    bw = bw_adjust * n ** (-1 / 5) * np.std(data, ddof=1) if n > 1 else 0.0
+    if not bw > 0:
+        # Like sns.kdeplot, skip the estimate for data without variance (or fewer than two points).
+        return np.empty(0), np.empty(0)
+    lo, hi = data.min() - cut * bw, data.max() + cut * bw
+
+    dx = (hi - lo) / (n_bins - 1)
+    pos = (data - lo) / dx
+    left = np.minimum(pos.astype(int), n_bins - 2)
+    weight = pos - left
+    counts = np.bincount(left, 1 - weight, minlength=n_bins) + np.bincount(
+        left + 1, weight, minlength=n_bins
+    )
 
-
-def sample_means(data, sample_size):
-    means = []
-
-    for _ in range(10_000):
-        sample = np.random.choice(data, size=sample_size)
-        means.append(np.mean(sample))
-
-    return np.array(means)
+    offsets = np.arange(-(n_bins - 1), n_bins) * dx
+    kernel = norm.pdf(offsets, scale=bw)
+    density = fftconvolve(counts, kernel, mode="same") / n
+
+    grid = np.linspace(lo, hi, gridsize)
+    return grid, np.interp(grid, np.linspace(lo, hi, n_bins), np.maximum(density, 0))
+
+
+@lru_cache(maxsize=8)
+def _normal_order_statistic_medians(n):
+    # Filliben's estimate, as used by stats.probplot.
+    u = (np.arange(1, n + 1) - 0.3175) / (n + 0.365)
+    u[-1] = 0.5 ** (1.0 / n)
+    u[0] = 1 - u[-1]
+    osm = ndtri(u)
+    osm.flags.writeable = False
+    return osm
+
+
+def fast_qq(data):
+    """
+    Normal probability plot values, like stats.probplot(data, fit=True) but
+    without drawing. The data are sorted once and the theoretical quantiles
+    are cached per sample size, so repeated redraws only pay for the sort.
+
+    Returns:
+    (osm, osr) -- theoretical quantiles and ordered values
+    (slope, intercept, r) -- least squares fit of osr on osm
+    """
+    osr = np.sort(np.asarray(data, dtype=float))
+    osm = _normal_order_statistic_medians(len(osr))
+
+    # osm is symmetric around 0, so its mean vanishes in the fit.
+    osr_mean = osr.mean()
+    sxx = np.dot(osm, osm)
+    sxy = np.dot(osm, osr)
+    syy = np.dot(osr - osr_mean, osr - osr_mean)
+    slope = sxy / sxx
+    intercept = osr_mean
+    r = sxy / np.sqrt(sxx * syy) if syy > 0 else 0.0
+
+    return (osm, osr), (slope, intercept, r)
+
+
+def _plot_kde(ax, grid, density):
+    ax.plot(grid, density, color="crimson", label="kde", linestyle="dashed")
+    ax.fill_between(grid, density, color="crimson", alpha=0.25, linewidth=0)
+
+
+def _plot_qq(ax, quantiles, fit):
+    osm, osr = quantiles
+    slope, intercept, r = fit
+    ax.plot(osm, osr, "bo")
+    ax.plot(osm, slope * osm + intercept, "r-")
+    ax.set_xlabel("Theoretical quantiles")
+    ax.set_ylabel("Ordered Values")
+    ax.set_title("Probability Plot")
+    xmin, xmax = osm[0], osm[-1]
+    ymin, ymax = osr[0], osr[-1]
+    ax.text(xmin + 0.70 * (xmax - xmin), ymin + 0.01 * (ymax - ymin), f"$R^2={r ** 2:1.4f}$")
+
+
+def _population_and_means(cache, distribution, params, sample_size, seed, population_size=100_000):
+    if cache is None:
+        draw, _ = CLT_DISTRIBUTIONS[distribution]
+        population = draw(np.random.default_rng(seed), population_size, **params)
+        return population, sample_means(population, sample_size, seed=_means_seed(seed, sample_size))
+    return cache.sample_means(distribution, params, sample_size, seed, population_size)
+
+
+def _streaming_population_and_means(draw, population_size, chunk_size, sample_size, seed):
+    # Seeded like _population_and_means: the population from seed, the means from their own stream.
+    population_summary = running_moments()
+    summary = streaming_sample_means(
+        population_chunks(draw, population_size, chunk_size, seed=seed),
+        sample_size,
+        seed=_means_seed(seed, sample_size),
+        population_summary=population_summary,
+    )
+    return population_summary, summary
 
 
-def gaussian_clt():
+def gaussian_clt(population_size=100_000, chunk_size=None, seed=None, cache=CLT_CACHE):
+    """
+    Interactive CLT check for a gaussian population. If chunk_size is given the
+    population is generated and summarized in chunks with streaming_sample_means,
+    so population_size can be far larger than memory. Otherwise populations and
+    sample means are reused from cache (a population_cache, None to disable)
+    when the same (mu, sigma, seed) is selected again.
+    """
     def _plot(mu, sigma, sample_size):
         #         mu = 10
         #         sigma = 5
 
-        gaussian_population = np.random.normal(mu, sigma, 100_000)
-        gaussiam_sample_means = sample_means(gaussian_population, sample_size)
-        x_range = np.linspace(
-            min(gaussiam_sample_means), max(gaussiam_sample_means), 100
-        )
+        if chunk_size is None:
+            gaussian_population, gaussiam_sample_means = _population_and_means(
+                cache, "gaussian", {"mu": mu, "sigma": sigma}, sample_size, seed, population_size
+            )
+            means_min, means_max = min(gaussiam_sample_means), max(gaussiam_sample_means)
+            sample_means_mean = np.mean(gaussiam_sample_means)
+            sample_means_std = np.std(gaussiam_sample_means)
+        else:
+            population_summary, summary = _streaming_population_and_means(
+                lambda rng, size: rng.normal(mu, sigma, size), population_size, chunk_size, sample_size, seed
+            )
+            gaussian_population = population_summary.reservoir
+            gaussiam_sample_means = summary.reservoir
+            means_min, means_max = summary.min, summary.max
+            sample_means_mean = summary.mean
+            sample_means_std = summary.std
+
+        x_range = np.linspace(means_min, means_max, 100)
 
-        sample_means_mean = np.mean(gaussiam_sample_means)
-        sample_means_std = np.std(gaussiam_sample_means)
         clt_std = sigma / np.sqrt(sample_size)
 
         estimated_pop_sigma = sample_means_std * np.sqrt(sample_size)
 
-        std_err = abs(clt_std - sample_means_std) / clt_std
-
-        clt_holds = True if std_err < 0.1 else False
+        std_err, clt_holds = clt_std_error(sample_means_std, clt_std)
 
         #         print(f"Mean of sample means: {sample_means_mean:.2f}\n")
         #         print(f"Std of sample means: {sample_means_std:.2f}\n")
@@ -62,14 +458,7 @@ def gaussian_clt():
         ax3.set_title("QQ Plot of Sample Means")
 
         sns.histplot(gaussiam_sample_means, stat="density", ax=ax2, label="hist")
-        sns.kdeplot(
-            data=gaussiam_sample_means,
-            color="crimson",
-            ax=ax2,
-            label="kde",
-            linestyle="dashed",
-            fill=True,
-        )
+        _plot_kde(ax2, *fast_kde(gaussiam_sample_means))
         ax2.plot(
             x_range,
             norm.pdf(x_range, loc=mu2, scale=sigma2),
@@ -79,7 +468,7 @@ def gaussian_clt():
         )
         ax2.legend()
 
-        stats.probplot(gaussiam_sample_means, plot=ax3, fit=True)
+        _plot_qq(ax3, *fast_qq(gaussiam_sample_means))
         plt.tight_layout()
         plt.show()
 
@@ -127,16 +516,16 @@ def gaussian_clt():
     )
 
 
-def binomial_clt():
+def binomial_clt(seed=None, cache=CLT_CACHE):
     def _plot(n, p, sample_size):
         mu = n * p
         sigma = np.sqrt(n * p * (1 - p)) / np.sqrt(sample_size)
         N = n * sample_size
 #         sigma = np.sqrt(n * p * (1 - p)) / np.sqrt(N)
 
-        binomial_population = np.random.binomial(n, p, 100_000)
-
-        binomial_sample_means = sample_means(binomial_population, sample_size)
+        binomial_population, binomial_sample_means = _population_and_means(
+            cache, "binomial", {"n": n, "p": p}, sample_size, seed
+        )
 
         x_range = np.linspace(
             min(binomial_sample_means), max(binomial_sample_means), 100
@@ -152,9 +541,7 @@ def binomial_clt():
 
         estimated_pop_sigma = sample_means_std * np.sqrt(sample_size)
 
-        std_err = abs(clt_std - sample_means_std) / clt_std
-
-        clt_holds = True if std_err < 0.1 else False
+        std_err, clt_holds = clt_std_error(sample_means_std, clt_std)
 
         #         print(f"Value of N: {N}\n")
         print(f"Condition value: {condition_val:.1f}")
@@ -173,14 +560,7 @@ def binomial_clt():
         sns.histplot(binomial_population, stat="density", ax=ax1)
 
         sns.histplot(binomial_sample_means, stat="density", ax=ax2, label="hist")
-        sns.kdeplot(
-            data=binomial_sample_means,
-            color="crimson",
-            ax=ax2,
-            label="kde",
-            linestyle="dashed",
-            fill=True,
-        )
+        _plot_kde(ax2, *fast_kde(binomial_sample_means))
         ax2.plot(
             x_range,
             norm.pdf(x_range, loc=mu, scale=sigma),
@@ -189,7 +569,7 @@ def binomial_clt():
             linestyle="solid",
         )
         ax2.legend()
-        stats.probplot(binomial_sample_means, plot=ax3, fit=True)
+        _plot_qq(ax3, *fast_qq(binomial_sample_means))
         plt.tight_layout()
         plt.show()
 
@@ -247,13 +627,13 @@ def binomial_clt():
     )
 
 
-def poisson_clt():
+def poisson_clt(seed=None, cache=CLT_CACHE):
     def _plot(mu, sample_size):
         sigma = np.sqrt(mu) / np.sqrt(sample_size)
 
-        poisson_population = np.random.poisson(mu, 100_000)
-
-        poisson_sample_means = sample_means(poisson_population, sample_size)
+        poisson_population, poisson_sample_means = _population_and_means(
+            cache, "poisson", {"mu": mu}, sample_size, seed
+        )
 
         x_range = np.linspace(min(poisson_sample_means), max(poisson_sample_means), 100)
 
@@ -270,14 +650,7 @@ def poisson_clt():
         sns.histplot(poisson_population, stat="density", ax=ax1)
 
         sns.histplot(poisson_sample_means, stat="density", ax=ax2, label="hist")
-        sns.kdeplot(
-            data=poisson_sample_means,
-            color="crimson",
-            ax=ax2,
-            label="kde",
-            linestyle="dashed",
-            fill=True,
-        )
+        _plot_kde(ax2, *fast_kde(poisson_sample_means))
         ax2.plot(
             x_range,
             norm.pdf(x_range, loc=mu, scale=sigma),
@@ -286,7 +659,7 @@ def poisson_clt():
             linestyle="solid",
         )
         ax2.legend()
-        stats.probplot(poisson_sample_means, plot=ax3, fit=True)
+        _plot_qq(ax3, *fast_qq(poisson_sample_means))
         plt.tight_layout()
         plt.show()
 
@@ -322,21 +695,21 @@ def poisson_clt():
 def plot_kde_and_qq(sample_means_data, mu_sample_means, sigma_sample_means):
     fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(10, 4))
 
+    # A running_moments summary is plotted through its reservoir of sample means
+    if isinstance(sample_means_data, running_moments):
+        means_min, means_max = sample_means_data.min, sample_means_data.max
+        sample_means_data = sample_means_data.reservoir
+    else:
+        means_min, means_max = min(sample_means_data), max(sample_means_data)
+
     # Define the x-range for the Gaussian curve (this is just for plotting purposes)
-    x_range = np.linspace(min(sample_means_data), max(sample_means_data), 100)
+    x_range = np.linspace(means_min, means_max, 100)
 
     # Histogram of sample means (blue)
     sns.histplot(sample_means_data, stat="density", label="hist", ax=ax1)
 
     # Estimated PDF of sample means (red)
-    sns.kdeplot(
-        data=sample_means_data,
-        color="crimson",
-        label="kde",
-        linestyle="dashed",
-        fill=True,
-        ax=ax1,
-    )
+    _plot_kde(ax1, *fast_kde(sample_means_data))
 
     # Gaussian curve with estimated mu and sigma (black)
     ax1.plot(
@@ -346,7 +719,78 @@ def plot_kde_and_qq(sample_means_data, mu_sample_means, sigma_sample_means):
         label="gaussian",
     )
 
-    res = stats.probplot(sample_means_data, plot=ax2, fit=True)
+    res = fast_qq(sample_means_data)
+    _plot_qq(ax2, *res)
 
     ax1.legend()
     plt.show()
+
+
+def _clt_task(task):
+    distribution, params, sample_size, population_size, n_samples, seed_seq = task
+    draw, population_sigma = CLT_DISTRIBUTIONS[distribution]
+    rng = np.random.default_rng(seed_seq)
+
+    population = draw(rng, population_size, **params)
+    means = sample_means(population, sample_size, n_samples=n_samples, seed=rng)
+
+    sample_means_std = np.std(means)
+    clt_std = population_sigma(**params) / np.sqrt(sample_size)
+    std_err, clt_holds = clt_std_error(sample_means_std, clt_std)
+
+    return {
+        "distribution": distribution,
+        **params,
+        "sample_size": sample_size,
+        "sample_means_mean": np.mean(means),
+        "sample_means_std": sample_means_std,
+        "clt_std": clt_std,
+        "std_err": std_err,
+        "clt_holds": clt_holds,
+    }
+
+
+def clt_sweep(
+    grid,
+    sample_sizes,
+    population_size=100_000,
+    n_samples=10_000,
+    seed=None,
+    max_workers=None,
+):
+    """
+    Runs the CLT check of gaussian_clt/binomial_clt/poisson_clt headlessly for
+    every combination of distribution, parameters and sample size, on a process
+    pool. Each combination gets its own child of one SeedSequence, so the
+    results are reproducible for a fixed seed regardless of max_workers.
+
+    Arguments:
+    grid -- dict mapping a CLT_DISTRIBUTIONS name to a list of parameter dicts,
+            e.g. {"gaussian": [{"mu": 10, "sigma": 5}], "poisson": [{"mu": 1.5}]}
+    sample_sizes -- iterable of sample sizes
+    population_size -- size of each simulated population
+    n_samples -- number of sample means per combination
+    seed -- seed for the root SeedSequence
+    max_workers -- number of processes, 1 runs everything in this process
+
+    Returns:
+    df -- DataFrame with one row per combination
+    """
+    combinations = [
+        (distribution, params, sample_size)
+        for distribution, param_list in grid.items()
+        for params, sample_size in product(param_list, sample_sizes)
+    ]
+    seeds = np.random.SeedSequence(seed).spawn(len(combinations))
+    tasks = [
+        (distribution, params, sample_size, population_size, n_samples, seed_seq)
+        for (distribution, params, sample_size), seed_seq in zip(combinations, seeds)
+    ]
+
+    if max_workers == 1:
+        rows = list(map(_clt_task, tasks))
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            rows = list(executor.map(_clt_task, tasks, chunksize=max(1, len(tasks) // 64)))
+
+    return pd.DataFrame(rows)
@@ -0,0 +1,199 @@
+import numpy as np
+import seaborn as sns
+import matplotlib.pyplot as plt
+from scipy import stats
+
+
+def test_fast_kde(target_fast_kde):
+    successful_cases = 0
+    failed_cases = []
+
+    rng = np.random.default_rng(0)
+    test_cases = [
+        {
+            "name": "gaussian_check",
+            "input": {"data": rng.normal(10, 5, 10_000)},
+        },
+        {
+            "name": "skewed_check",
+            "input": {"data": rng.gamma(2, size=10_000)},
+        },
+        {
+            "name": "discrete_means_check",
+            "input": {"data": rng.binomial(10, 0.3, size=(10_000, 4)).mean(axis=1)},
+        },
+    ]
+
+    for test_case in test_cases:
+        grid, density = target_fast_kde(test_case["input"]["data"])
+
+        fig, ax = plt.subplots()
+        sns.kdeplot(test_case["input"]["data"], ax=ax)
+        expected_grid, expected_density = ax.lines[0].get_data()
+        plt.close(fig)
+
+        try:
+            assert np.allclose(grid, expected_grid)
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": expected_grid[[0, -1]],
+                    "got": grid[[0, -1]],
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong evaluation grid. \n\tExpected range: {failed_cases[-1].get('expected')}.\n\tGot: {failed_cases[-1].get('got')}."
+            )
+
+        # Binning error of the fast KDE, relative to the peak density.
+        error = np.max(np.abs(density - expected_density)) / np.max(expected_density)
+
+        try:
+            assert error < 1e-3
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": "< 1e-3",
+                    "got": error,
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Density differs from sns.kdeplot. \n\tExpected relative error: {failed_cases[-1].get('expected')}.\n\tGot: {failed_cases[-1].get('got')}."
+            )
+
+    # Constant data: sns.kdeplot skips the estimate, so the curve is empty.
+    grid, density = target_fast_kde(np.full(100, 3.0))
+    try:
+        assert len(grid) == 0 and len(density) == 0
+        successful_cases += 1
+    except:
+        failed_cases.append(
+            {
+                "name": "constant_check",
+                "expected": "empty grid and density",
+                "got": (grid[:3], density[:3]),
+            }
+        )
+        print(
+            f"Test case \"{failed_cases[-1].get('name')}\". Data without variance should give an empty curve. \n\tExpected: {failed_cases[-1].get('expected')}.\n\tGot: {failed_cases[-1].get('got')}."
+        )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_fast_qq(target_fast_qq):
+    successful_cases = 0
+    failed_cases = []
+
+    rng = np.random.default_rng(1)
+    test_cases = [
+        {
+            "name": "gaussian_check",
+            "input": {"data": rng.normal(10, 5, 10_000)},
+        },
+        {
+            "name": "odd_size_check",
+            "input": {"data": rng.poisson(1.5, size=(3_333, 2)).mean(axis=1)},
+        },
+    ]
+
+    for test_case in test_cases:
+        (osm, osr), fit = target_fast_qq(test_case["input"]["data"])
+        (expected_osm, expected_osr), expected_fit = stats.probplot(
+            test_case["input"]["data"], fit=True
+        )
+
+        try:
+            assert np.allclose(osm, expected_osm) and np.allclose(osr, expected_osr)
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": (expected_osm[:3], expected_osr[:3]),
+                    "got": (osm[:3], osr[:3]),
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong quantiles. \n\tExpected: {failed_cases[-1].get('expected')}.\n\tGot: {failed_cases[-1].get('got')}."
+            )
+
+        try:
+            assert np.allclose(fit, expected_fit)
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": expected_fit,
+                    "got": fit,
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Wrong fit (slope, intercept, r). \n\tExpected: {failed_cases[-1].get('expected')}.\n\tGot: {failed_cases[-1].get('got')}."
+            )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
+
+
+def test_streaming_population_and_means(target_streaming_population_and_means):
+    successful_cases = 0
+    failed_cases = []
+
+    test_cases = [
+        {
+            "name": "same_seed_check",
+            "input": {"population_size": 200_000, "chunk_size": 30_000, "sample_size": 5, "seed": 0},
+        },
+        {
+            "name": "uneven_chunks_check",
+            "input": {"population_size": 100_001, "chunk_size": 7_777, "sample_size": 3, "seed": 123},
+        },
+    ]
+
+    def draw(rng, size):
+        return rng.normal(10, 5, size)
+
+    for test_case in test_cases:
+        runs = [
+            target_streaming_population_and_means(draw, **test_case["input"]) for _ in range(2)
+        ]
+        (population_1, means_1), (population_2, means_2) = runs
+
+        try:
+            assert (
+                means_1.std == means_2.std
+                and means_1.mean == means_2.mean
+                and np.array_equal(means_1.reservoir, means_2.reservoir)
+                and np.array_equal(population_1.reservoir, population_2.reservoir)
+            )
+            successful_cases += 1
+        except:
+            failed_cases.append(
+                {
+                    "name": test_case["name"],
+                    "expected": means_1.std,
+                    "got": means_2.std,
+                }
+            )
+            print(
+                f"Test case \"{failed_cases[-1].get('name')}\". Two runs with seed {test_case['input']['seed']} differ. \n\tStd of the sample means of the first run: {failed_cases[-1].get('expected')}.\n\tSecond run: {failed_cases[-1].get('got')}."
+            )
+
+    if len(failed_cases) == 0:
+        print("\033[92m All tests passed")
+    else:
+        print("\033[92m", successful_cases, " Tests passed")
+        print("\033[91m", len(failed_cases), " Tests failed")
@@ -0,0 +1,137 @@
+"""
+Headless benchmarks for the Course-3 simulation helpers.
+
+Times sample_means (Week-3), the Monty Hall loop behind success_rate_plot and the
+birthday simulators (Week-1) and run_ab_test_* (Week-4) across input scales with
+fixed seeds, and reports throughput and peak traced memory. Results can be saved
+as a JSON baseline and later runs compared against it.
+
+    python benchmarks.py                          # default scales
+    python benchmarks.py --full                   # up to sample size 1000, 1e7 games, 3650 days
+    python benchmarks.py --save-baseline base.json
+    python benchmarks.py --baseline base.json     # exits with 1 on regressions
+"""
+import os
+import sys
+from datetime import date
+
+import numpy as np
+import matplotlib
+
+matplotlib.use("Agg")
+import matplotlib.pyplot as plt
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+sys.path.insert(0, os.path.dirname(HERE))
+from benchmark_harness import load_module, main
+
+w1_bday = load_module("c3_w1_utils1", os.path.join(HERE, "Week-1/utils1.py"))
+w1_monty = load_module("c3_w1_utils2", os.path.join(HERE, "Week-1/utils2.py"))
+w3_clt = load_module("c3_w3_utils", os.path.join(HERE, "Week-3/utils.py"))
+w4_ab = load_module("c3_w4_utils", os.path.join(HERE, "Week-4/utils.py"))
+
+# your_bday calls IPython's display, which is not a builtin outside of notebooks.
+w1_bday.display = lambda *args, **kwargs: None
+
+
+# Reference solutions from C3_W1_Lab_2_Monty_Hall, used to drive success_rate_plot's loop.
+def monty_hall(switch):
+    doors = np.array([0, 0, 0])
+    winner_index = np.random.randint(0, 3)
+    doors[winner_index] = 1
+    choice = np.random.randint(0, 3)
+    openable_doors = [i for i in range(3) if i not in (winner_index, choice)]
+    door_to_open = np.random.choice(openable_doors)
+    if switch:
+        choice = [i for i in range(3) if i not in (choice, door_to_open)][0]
+    return doors[choice]
+
+
+def generalized_monty_hall(switch, n=3, k=1):
+    doors = np.array([0 for _ in range(n)])
+    winner = np.random.randint(0, n)
+    doors[winner] = 1.0
+    choice = np.random.randint(0, n)
+    openable_doors = [i for i in range(n) if i not in (winner, choice)]
+    door_to_open = np.random.choice(openable_doors, size=k, replace=False)
+    if switch:
+        choices = [i for i in range(n) if i not in np.array(choice) and i not in np.array(door_to_open)]
+        choice = np.random.choice(choices)
+    return doors[choice]
+
+
+def bench_sample_means(sample_size):
+    population = np.random.default_rng(0).normal(10, 5, 100_000)
+    w3_clt.sample_means(population, sample_size, seed=0)
+    return 10_000
+
+
+def bench_monty_hall(n_iterations):
+    w1_monty.simulate_win_rate(monty_hall, n_iterations, switch=True)
+    return n_iterations
+
+
+def bench_generalized_monty_hall(n_iterations):
+    w1_monty.simulate_win_rate(generalized_monty_hall, n_iterations, switch=True, n=100, k=98)
+    return n_iterations
+
+
+def bench_simulate_monty_hall(n_iterations):
+    w1_monty.simulate_monty_hall(n_iterations, switch=True, seed=0)
+    return n_iterations
+
+
+def bench_your_bday(n_runs):
+    sim = w1_bday.your_bday()
+    sim.bday_picker.value = date(2015, 6, 15)
+    for _ in range(n_runs):
+        sim.on_button_clicked(None)
+    plt.close(sim.fig)
+    return n_runs
+
+
+def bench_third_bday_problem(n_runs):
+    sim = w1_bday.third_bday_problem()
+    for _ in range(n_runs):
+        sim.new_run()
+        sim.add_students()
+    plt.close(sim.fig)
+    return n_runs
+
+
+def bench_ab_test_background_color(n_days):
+    df = w4_ab.run_ab_test_background_color(n_days)
+    return len(df)
+
+
+def bench_ab_test_personalized_feed(n_days):
+    df = w4_ab.run_ab_test_personalized_feed(n_days)
+    return len(df)
+
+
+# name -> (function(scale) -> number of units processed, unit, default scales, full scales)
+BENCHMARKS = {
+    "sample_means": (bench_sample_means, "means", [2, 10, 100], [2, 10, 100, 1000]),
+    "success_rate_plot/monty_hall": (
+        bench_monty_hall, "games", [1_000, 10_000], [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+    ),
+    "success_rate_plot/generalized_monty_hall": (
+        bench_generalized_monty_hall, "games", [100, 1_000], [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+    ),
+    "simulate_monty_hall": (
+        bench_simulate_monty_hall, "games", [10_000, 1_000_000], [10_000, 1_000_000, 10_000_000]
+    ),
+    "utils1/your_bday": (bench_your_bday, "runs", [1, 10], [1, 10, 100]),
+    "utils1/third_bday_problem": (bench_third_bday_problem, "runs", [1], [1, 3, 10]),
+    "run_ab_test_background_color": (
+        bench_ab_test_background_color, "users", [1, 7], [1, 7, 30, 365, 3650]
+    ),
+    "run_ab_test_personalized_feed": (
+        bench_ab_test_personalized_feed, "users", [1, 7], [1, 7, 30, 365, 3650]
+    ),
+}
+
+
+if __name__ == "__main__":
+    sys.exit(main(BENCHMARKS, __doc__))
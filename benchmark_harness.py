@@ -0,0 +1,153 @@
+"""
+Shared command line harness of the per-course benchmarks.py scripts.
+
+A course script defines BENCHMARKS, a dict of name -> (function(scale) ->
+number of units processed, or (units, dict of extra results), unit, default
+scales, full scales), and ends with
+
+    sys.exit(main(BENCHMARKS, __doc__))
+
+A benchmark function can have a prepare(scale) attribute that builds its
+inputs (for instance a cached temporary file), called before timing starts.
+
+main times every benchmark at each scale with the global random generators
+seeded, reports throughput and peak traced memory, and can save the results
+as a JSON baseline or compare them against one:
+
+    python benchmarks.py                          # default scales
+    python benchmarks.py --full                   # the full range of scales
+    python benchmarks.py --save-baseline base.json
+    python benchmarks.py --baseline base.json     # exits with 1 on regressions
+"""
+import argparse
+import importlib.util
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+
+def load_module(name, path):
+    """
+    imports the module at path under a unique name, since several weeks have a
+    utils.py, with its folder on sys.path for its own imports
+    """
+    folder = os.path.dirname(os.path.abspath(path))
+    if folder not in sys.path:
+        sys.path.insert(0, folder)
+    spec = importlib.util.spec_from_file_location(name, path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def seed_everything(seed):
+    np.random.seed(seed)
+    random.seed(seed)
+
+
+def measure(func, scale, seed, repeat):
+    """
+    returns best wall time over repeat runs, units processed, peak traced memory
+    in bytes and the dict of extra results a benchmark may return with its units
+    """
+    prepare = getattr(func, "prepare", None)
+    if prepare is not None:
+        prepare(scale)
+    best = np.inf
+    for _ in range(repeat):
+        seed_everything(seed)
+        start = time.perf_counter()
+        units = func(scale)
+        best = min(best, time.perf_counter() - start)
+    units, extra = units if isinstance(units, tuple) else (units, {})
+
+    # Memory is traced in a separate run, since tracemalloc slows allocation down.
+    seed_everything(seed)
+    tracemalloc.start()
+    func(scale)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return best, units, peak, extra
+
+
+def run_benchmarks(benchmarks, names=None, full=False, seed=42, repeat=3, max_seconds=30.0):
+    """
+    Runs the selected benchmarks and returns a list of result dicts. Larger
+    scales of a benchmark are skipped once one run takes more than max_seconds.
+    """
+    results = []
+    for name, (func, unit, scales, full_scales) in benchmarks.items():
+        if names and name not in names:
+            continue
+        for scale in full_scales if full else scales:
+            seconds, units, peak, extra = measure(func, scale, seed, repeat)
+            results.append(
+                {
+                    "name": name,
+                    "scale": scale,
+                    "seconds": seconds,
+                    "throughput": units / seconds,
+                    "unit": unit,
+                    "peak_mb": peak / 2**20,
+                    **extra,
+                }
+            )
+            print(
+                f"{name:42s} scale={scale:<10} {seconds:10.4f} s "
+                f"{units / seconds:14.1f} {unit}/s {peak / 2**20:10.2f} MB"
+                + "".join(f" {key}={value:.4g}" for key, value in extra.items()),
+                flush=True,
+            )
+            if seconds > max_seconds:
+                print(f"{name:42s} skipping larger scales (> {max_seconds} s)")
+                break
+    return results
+
+
+def compare_to_baseline(results, baseline, tolerance=1.25):
+    """ returns the results whose time exceeds tolerance times the baseline time at the same scale """
+    reference = {(b["name"], b["scale"]): b for b in baseline}
+    regressions = []
+    for result in results:
+        base = reference.get((result["name"], result["scale"]))
+        if base is not None and result["seconds"] > tolerance * base["seconds"]:
+            regressions.append({**result, "baseline_seconds": base["seconds"]})
+    return regressions
+
+
+def main(benchmarks, description, argv=None):
+    """ command line entry point of a course's benchmarks.py, returns the exit status """
+    parser = argparse.ArgumentParser(description=description.strip().splitlines()[0])
+    parser.add_argument("names", nargs="*", help="benchmarks to run, all by default")
+    parser.add_argument("--full", action="store_true", help="run the full range of scales")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--max-seconds", type=float, default=30.0)
+    parser.add_argument("--baseline", help="JSON baseline to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25)
+    parser.add_argument("--save-baseline", help="write the results as a JSON baseline")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(benchmarks, args.names, args.full, args.seed, args.repeat, args.max_seconds)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare_to_baseline(results, json.load(f), args.tolerance)
+        for r in regressions:
+            print(
+                f"REGRESSION {r['name']} scale={r['scale']}: "
+                f"{r['seconds']:.4f} s vs baseline {r['baseline_seconds']:.4f} s"
+            )
+        if regressions:
+            return 1
+    return 0
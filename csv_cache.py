@@ -0,0 +1,161 @@
+"""
+Columnar cache for the course CSV datasets.
+
+The first load of a CSV parses it with pandas and writes every column as its own
+typed .npy file plus a schema.json into a cache folder named after the SHA-256 of
+the file, so identical copies of a dataset (house_prices_train.csv is in both
+Course-1/Week-3/data and Course-2/Week-3/data) share one cache. Later loads
+memory-map only the requested columns and never parse the CSV again.
+
+    import sys; sys.path.append("../..")  # from a week's folder
+    from csv_cache import load_csv, load_dataframe
+
+    data = load_csv("data/house_prices_train.csv", columns=["GrLivArea", "SalePrice"])
+    data["GrLivArea"]  # read-only np.memmap
+    df = load_dataframe("data/tvmarketing.csv")
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".cache", "csv")
+
+
+def file_hash(path, chunk_size=2**20):
+    """ SHA-256 hex digest of a file's bytes """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def cached_file_hash(path, cache_dir=CACHE_DIR):
+    """
+    file_hash, remembered per (absolute path, size, modification time) in an
+    index in cache_dir, so unchanged files are not read again to be hashed
+    """
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    index_path = os.path.join(cache_dir, "hashes.json")
+    try:
+        with open(index_path) as f:
+            index = json.load(f)
+    except (OSError, ValueError):
+        index = {}
+    if key not in index:
+        index[key] = file_hash(path)
+        os.makedirs(cache_dir, exist_ok=True)
+        with tempfile.NamedTemporaryFile("w", dir=cache_dir, delete=False, suffix=".json") as f:
+            json.dump(index, f, indent=1)
+        os.replace(f.name, index_path)
+    return index[key]
+
+
+def build_cache(path, folder, **read_csv_kwargs):
+    """
+    Parses the CSV once and writes one .npy per column and schema.json into
+    folder. Numeric columns keep their pandas dtype; other columns are stored
+    as fixed-width unicode strings, with missing values as "" and a boolean
+    .npy marking them.
+    """
+    df = pd.read_csv(path, **read_csv_kwargs)
+    parent = os.path.dirname(folder)
+    os.makedirs(parent, exist_ok=True)
+    # Written into a temporary folder first, so a partly written cache is never used.
+    tmp = tempfile.mkdtemp(dir=parent)
+    columns = []
+    for i, name in enumerate(df.columns):
+        column = df[name]
+        entry = {"name": str(name), "file": f"column_{i:03d}.npy"}
+        if pd.api.types.is_numeric_dtype(column) or pd.api.types.is_bool_dtype(column):
+            values = column.to_numpy()
+        else:
+            missing = column.isna().to_numpy()
+            values = column.astype(str).where(~missing, "").to_numpy().astype(str)
+            if missing.any():
+                entry["missing_file"] = f"column_{i:03d}_missing.npy"
+                np.save(os.path.join(tmp, entry["missing_file"]), missing)
+        np.save(os.path.join(tmp, entry["file"]), values)
+        entry["dtype"] = values.dtype.str
+        entry["pandas_dtype"] = str(column.dtype)
+        columns.append(entry)
+
+    schema = {
+        "source": os.path.basename(path),
+        "sha256": os.path.basename(folder),
+        "n_rows": len(df),
+        "read_csv_kwargs": read_csv_kwargs,
+        "columns": columns,
+    }
+    with open(os.path.join(tmp, "schema.json"), "w") as f:
+        json.dump(schema, f, indent=1)
+    try:
+        os.rename(tmp, folder)
+    except OSError:
+        # Another process built the same cache first.
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+def cache_folder(path, cache_dir=CACHE_DIR, **read_csv_kwargs):
+    """ returns the cache folder of a CSV, building the cache on first use """
+    key = cached_file_hash(path, cache_dir)
+    if read_csv_kwargs:
+        # Different parsing options give different columns, so they get their own cache.
+        options = json.dumps(read_csv_kwargs, sort_keys=True, default=str).encode()
+        key = f"{key}-{hashlib.sha256(options).hexdigest()[:16]}"
+    folder = os.path.join(cache_dir, key)
+    if not os.path.exists(os.path.join(folder, "schema.json")):
+        build_cache(path, folder, **read_csv_kwargs)
+    return folder
+
+
+def load_schema(path, cache_dir=CACHE_DIR, **read_csv_kwargs):
+    """ the schema.json of a CSV's cache: source, sha256, n_rows and the columns with their dtypes """
+    with open(os.path.join(cache_folder(path, cache_dir, **read_csv_kwargs), "schema.json")) as f:
+        return json.load(f)
+
+
+def load_csv(path, columns=None, cache_dir=CACHE_DIR, **read_csv_kwargs):
+    """
+    Returns a dict of column name -> read-only memory-mapped array for the
+    requested columns (all by default), in the requested order. Only those
+    columns' files are opened. read_csv_kwargs are passed to pd.read_csv when
+    the cache is built.
+    """
+    folder = cache_folder(path, cache_dir, **read_csv_kwargs)
+    with open(os.path.join(folder, "schema.json")) as f:
+        schema = json.load(f)
+    by_name = {entry["name"]: entry for entry in schema["columns"]}
+    names = list(by_name) if columns is None else list(columns)
+    missing = [name for name in names if name not in by_name]
+    if missing:
+        raise KeyError(f"columns {missing} not in {schema['source']}")
+    return {name: np.load(os.path.join(folder, by_name[name]["file"]), mmap_mode="r") for name in names}
+
+
+def load_dataframe(path, columns=None, cache_dir=CACHE_DIR, **read_csv_kwargs):
+    """
+    load_csv as a pandas DataFrame, with missing strings restored as NaN and
+    every column cast back to the dtype pd.read_csv gave it. Unlike load_csv
+    this copies the requested columns into memory.
+    """
+    folder = cache_folder(path, cache_dir, **read_csv_kwargs)
+    with open(os.path.join(folder, "schema.json")) as f:
+        by_name = {entry["name"]: entry for entry in json.load(f)["columns"]}
+    data = load_csv(path, columns, cache_dir, **read_csv_kwargs)
+    df = pd.DataFrame({name: np.array(values) for name, values in data.items()})
+    for name in df.columns:
+        if "missing_file" in by_name[name]:
+            missing = np.load(os.path.join(folder, by_name[name]["missing_file"]))
+            df[name] = df[name].astype(object).where(~missing, np.nan)
+        # Caches built before the pandas dtype was recorded keep the dtype of the arrays.
+        pandas_dtype = by_name[name].get("pandas_dtype")
+        if pandas_dtype is not None and str(df[name].dtype) != pandas_dtype:
+            df[name] = df[name].astype(pandas_dtype)
+    return df